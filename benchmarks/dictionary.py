@@ -0,0 +1,319 @@
+"""Benchmarks for the word list: loading and querying Words, and the word helpers in utils.
+
+Runs offline against on9wordchainbot/words.txt and synthetic word lists of the given sizes.
+Like the bot itself, it needs config.json in the working directory to import the package.
+
+    python -m benchmarks.dictionary [--sizes real,1000000,5000000] [--iterations 2000] [--output results.json]
+
+Each word list is benchmarked in a fresh process so that load times and peak RSS are its own.
+Results are written as JSON (to stdout unless --output is given) with a summary on stderr.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from string import ascii_lowercase
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REAL_WORD_FILE = os.path.join(REPO_DIR, "on9wordchainbot", "words.txt")
+DEFAULT_SIZES = "real,1000000,5000000"
+
+# Approximate English letter frequencies, used for synthetic words
+LETTER_FREQUENCIES = np.array([
+    8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+    6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074
+])
+
+
+def generate_word_list(path: str, size: int, seed: int = 0) -> None:
+    """Write about size random words to path, one per line. Short duplicates are dropped on loading."""
+    rng = np.random.default_rng(seed)
+    lengths = np.clip(np.rint(rng.normal(9, 3, size)), 2, 20).astype(np.int64)
+    letters = rng.choice(
+        np.frombuffer(ascii_lowercase.encode(), dtype=np.uint8),
+        size=int(lengths.sum()),
+        p=LETTER_FREQUENCIES / LETTER_FREQUENCIES.sum()
+    )
+    ends = np.cumsum(lengths + 1) - 1  # Positions of the newlines
+    buf = np.empty(int(ends[-1]) + 1, dtype=np.uint8)
+    is_newline = np.zeros(len(buf), dtype=bool)
+    is_newline[ends] = True
+    buf[is_newline] = ord("\n")
+    buf[~is_newline] = letters
+    with open(path, "wb") as f:
+        f.write(buf.tobytes())
+
+
+def peak_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # Bytes on macOS, KiB elsewhere
+
+
+def summarize(samples_ns: Sequence[int]) -> Dict[str, float]:
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1000  # Microseconds
+    total = samples.sum() / 1e6
+    return {
+        "count": len(samples),
+        "mean_us": round(float(samples.mean()), 3),
+        "p50_us": round(float(np.percentile(samples, 50)), 3),
+        "p90_us": round(float(np.percentile(samples, 90)), 3),
+        "p99_us": round(float(np.percentile(samples, 99)), 3),
+        "max_us": round(float(samples.max()), 3),
+        "ops_per_s": round(len(samples) / total, 1) if total else None
+    }
+
+
+def time_calls(f: Callable[..., Any], args: Sequence[Any]) -> Dict[str, float]:
+    samples = []
+    for a in args:
+        t = time.perf_counter_ns()
+        f(*a)
+        samples.append(time.perf_counter_ns() - t)
+    return summarize(samples)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """word with a random substitution, deletion, insertion or transposition after its first letter."""
+    if len(word) < 3:
+        return word + rng.choice(ascii_lowercase)
+    i = rng.randrange(1, len(word) - 1)
+    return rng.choice([
+        word[:i] + rng.choice(ascii_lowercase) + word[i + 1:],
+        word[:i] + word[i + 1:],
+        word[:i] + rng.choice(ascii_lowercase) + word[i:],
+        word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    ])
+
+
+def wildcard(word: str, rng: random.Random) -> str:
+    """/pattern query matching word, with some letters replaced by ? and possibly a run of them by *."""
+    pattern = [c if rng.random() < 0.5 else "?" for c in word]
+    if rng.random() < 0.5:
+        i = rng.randrange(len(pattern))
+        pattern[i:rng.randint(i + 1, len(pattern))] = ["*"]
+    return "".join(pattern)
+
+
+def constraint_cases(words: Any, n: int, rng: random.Random) -> Dict[str, List[Dict[str, Any]]]:
+    """Arguments of n calls for each constraint mix used by the game modes, against the WordList words."""
+    from on9wordchainbot.dictionary import UsedWords
+
+    def used_words() -> UsedWords:
+        # Words used by the time a game reaches its later turns, kept as games keep them
+        used = UsedWords(words)
+        for _ in range(rng.randint(20, 200)):
+            used.add(words.sample())
+        return used
+
+    def banned_letters(prefix: str) -> List[str]:
+        # As in BannedLettersGame.set_banned_letters
+        alphabets = sorted(set(ascii_lowercase) - {prefix})
+        banned = []
+        for _ in range(rng.randint(2, 4)):
+            banned.append(rng.choice(alphabets))
+            if banned[-1] in "aeiou":
+                alphabets = [c for c in alphabets if c not in "aeiou"]
+            else:
+                alphabets.remove(banned[-1])
+        return sorted(banned)
+
+    cases: Dict[str, List[Dict[str, Any]]] = {
+        "classic": [], "hard": [], "banned_letters": [], "required_letter": [], "reverse_chain": []
+    }
+    for _ in range(n):
+        prefix = rng.choice(ascii_lowercase)
+        cases["classic"].append(
+            dict(min_len=rng.randint(3, 10), prefix=prefix, exclude_words=used_words())
+        )
+        cases["hard"].append(dict(min_len=10, prefix=prefix, exclude_words=used_words()))
+        cases["banned_letters"].append(
+            dict(
+                min_len=rng.randint(3, 10), prefix=prefix, banned_letters=banned_letters(prefix),
+                exclude_words=used_words()
+            )
+        )
+        cases["required_letter"].append(
+            dict(
+                min_len=rng.randint(3, 10), prefix=prefix,
+                required_letter=rng.choice([c for c in ascii_lowercase if c != prefix]),
+                exclude_words=used_words()
+            )
+        )
+        cases["reverse_chain"].append(
+            dict(min_len=rng.randint(3, 10), suffix=prefix, exclude_words=used_words())
+        )
+    return cases
+
+
+def run_dataset(name: str, source_path: str, iterations: int, seed: int) -> Dict[str, Any]:
+    """Benchmark one word list in this process."""
+    from on9wordchainbot import utils, words as words_module
+    from on9wordchainbot.words import Words
+
+    rng = random.Random(seed)
+    result: Dict[str, Any] = {"name": name, "load": {}, "cases": {}}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Work on a copy so that neither the word list nor its compiled artifact in the package is touched
+        words_module.WORD_FILE = os.path.join(tmp_dir, "words.txt")
+        words_module.ARTIFACT_FILE = os.path.join(tmp_dir, "words.bin")
+        shutil.copyfile(source_path, words_module.WORD_FILE)
+
+        async def load() -> float:
+            Words.ready.clear()
+            Words.source = None
+            t = time.perf_counter()
+            await Words.update()
+            return time.perf_counter() - t
+
+        # Cold: words.txt is compiled, warm: the compiled artifact is mapped
+        result["load"]["cold_s"] = round(asyncio.run(load()), 4)
+        result["load"]["warm_s"] = round(asyncio.run(load()), 4)
+        result["words"] = Words.snapshot.count
+        result["artifact_bytes"] = os.path.getsize(words_module.ARTIFACT_FILE)
+        result["fuzzy_index_bytes"] = Words.snapshot.words.base.fuzzy.nbytes
+        result["position_index_bytes"] = Words.snapshot.words.base.positions.nbytes
+        result["anagram_index_bytes"] = Words.snapshot.words.base.anagrams.nbytes
+        result["rss_after_load_kb"] = peak_rss_kb()
+
+        # Incremental refresh after a small edit of words.txt
+        removed = {Words.snapshot.words.sample() for _ in range(100)}
+        with open(words_module.WORD_FILE, encoding="utf-8") as f:
+            lines = [line for line in f if line.strip().lower() not in removed]
+        lines += [f"benchmarkword{''.join(rng.choices(ascii_lowercase, k=8))}\n" for _ in range(100)]
+        with open(words_module.WORD_FILE, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        t = time.perf_counter()
+        update = asyncio.run(Words.update())
+        result["load"]["refresh_s"] = round(time.perf_counter() - t, 4)
+        result["load"]["refresh_ms"] = round(update.seconds * 1000, 3) if update else None
+
+        sample = Words.snapshot.words.sample
+        present = [sample() for _ in range(iterations)]
+        absent = ["".join(rng.choices(ascii_lowercase, k=rng.randint(12, 16))) + "q" for _ in range(iterations)]
+        prefixes = [w[:rng.randint(1, 3)] for w in present]
+
+        cases = result["cases"]
+        cases["check_word_existence/hit"] = time_calls(utils.check_word_existence, [(w,) for w in present])
+        cases["check_word_existence/miss"] = time_calls(utils.check_word_existence, [(w,) for w in absent])
+        cases["suggest_words/typo"] = time_calls(
+            lambda w: utils.suggest_words(w, min_len=3, prefix=w[0]), [(typo(w, rng),) for w in present]
+        )
+        # As many results as /pattern shows
+        cases["match_pattern/wildcards"] = time_calls(
+            lambda p: Words.snapshot.words.match_pattern(p, 1001), [(wildcard(w, rng),) for w in present]
+        )
+        shuffled = ["".join(rng.sample(w, len(w))) for w in present]
+        cases["anagrams/shuffled"] = time_calls(Words.snapshot.words.anagrams, [(w,) for w in shuffled])
+        cases["formable/shuffled"] = time_calls(
+            lambda w: Words.snapshot.words.formable(w, min_len=3), [(w,) for w in shuffled]
+        )
+        cases["starts_with/inline_prefix"] = time_calls(
+            lambda p: list(islice(Words.starts_with(p), 50)), [(p,) for p in prefixes]
+        )
+        for mix, calls in constraint_cases(Words.snapshot.words, iterations, rng).items():
+            cases[f"get_random_word/{mix}"] = time_calls(lambda kw: utils.get_random_word(**kw), [(c,) for c in calls])
+            # Scans every candidate, so fewer calls
+            calls = calls[:max(1, iterations // 10)]
+            cases[f"filter_words/{mix}"] = time_calls(lambda kw: utils.filter_words(**kw), [(c,) for c in calls])
+
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    for dataset in results["datasets"]:
+        load = dataset["load"]
+        print(
+            f"{dataset['name']}: {dataset['words']} words, cold load {load['cold_s']}s, warm load {load['warm_s']}s, "
+            f"refresh {load['refresh_s']}s, peak RSS {dataset['peak_rss_kb'] // 1024}MiB, "
+            f"fuzzy index {dataset['fuzzy_index_bytes'] // 1024 ** 2}MiB, "
+            f"position index {dataset['position_index_bytes'] // 1024 ** 2}MiB, "
+            f"anagram index {dataset['anagram_index_bytes'] // 1024 ** 2}MiB",
+            file=sys.stderr
+        )
+        for case, stats in dataset["cases"].items():
+            print(
+                f"  {case:32} p50 {stats['p50_us']:>10}us  p99 {stats['p99_us']:>10}us  {stats['ops_per_s']:>10} ops/s",
+                file=sys.stderr
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES,
+        help=f"comma separated word list sizes, 'real' for words.txt (default: {DEFAULT_SIZES})"
+    )
+    parser.add_argument("--iterations", type=int, default=2000, help="calls per operation (default: 2000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the JSON results to")
+    # Internal: benchmark a single word list in this process and print its results
+    parser.add_argument("--dataset", nargs=2, metavar=("NAME", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.dataset:
+        json.dump(run_dataset(*args.dataset, args.iterations, args.seed), sys.stdout)
+        return
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "seed": args.seed
+        },
+        "datasets": []
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes.split(","):
+            if size == "real":
+                name, path = "words.txt", REAL_WORD_FILE
+            else:
+                name, path = f"synthetic-{size}", os.path.join(tmp_dir, f"synthetic-{size}.txt")
+                print(f"Generating {size} synthetic words", file=sys.stderr)
+                generate_word_list(path, int(size), args.seed)
+            print(f"Benchmarking {name}", file=sys.stderr)
+            out = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.dictionary", "--dataset", name, path,
+                    "--iterations", str(args.iterations), "--seed", str(args.seed)
+                ],
+                cwd=os.getcwd(), stdout=subprocess.PIPE, check=True
+            ).stdout
+            results["datasets"].append(json.loads(out))
+
+    print_summary(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,528 @@
+"""Headless game simulator: plays every game mode with scripted players and the virtual player, offline.
+
+Games run their real main loop on an event loop with a virtual clock, which jumps to the next timer
+instead of waiting for it, so a game of several minutes takes milliseconds. Messages go to a null
+transport that only counts them, and the database calls are dropped.
+Like the bot itself, it needs config.json in the working directory to import the package.
+
+    python -m benchmarks.games [--modes classic,elim] [--games 1000] [--workers 8] [--vp hard] [--output results.json]
+
+Scripted players answer a turn with probability --skill after a random thinking time,
+picking a random valid answer, and sometimes send a used word first. With --vp, On9Bot plays too.
+Games are split across a process pool. For each mode, the game lengths, the share of turns
+whose player had no valid answer (dead ends) and the engine CPU time per turn are reported as JSON
+(to stdout unless --output is given) with a summary on stderr.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import selectors
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .dictionary import REAL_WORD_FILE, generate_word_list, git_commit, summarize
+
+# User ids of the simulated players and the virtual player
+BOT_USER_ID = 1
+VP_USER_ID = 2
+FIRST_PLAYER_ID = 1000
+# Games per task sent to a worker
+BATCH_SIZE = 25
+
+
+class VirtualClockSelector(selectors.DefaultSelector):
+    """Selector that never blocks: waiting for a timer advances the clock to it instead."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.clock = 0.0
+
+    def select(self, timeout: Optional[float] = None) -> List[Tuple[selectors.SelectorKey, int]]:
+        ready = super().select(0)
+        if not ready and timeout:
+            self.clock += timeout
+        return ready
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop on virtual time, running executor jobs inline so that games are deterministic."""
+
+    def __init__(self) -> None:
+        super().__init__(VirtualClockSelector())
+        self.set_default_executor(InlineExecutor())
+
+    def time(self) -> float:
+        return self._selector.clock
+
+
+class InlineExecutor(ThreadPoolExecutor):
+    """Runs jobs in the calling thread as they are submitted."""
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class NullTransport:
+    """Stands in for the bots and the database. Drops everything, counting messages sent."""
+
+    def __init__(self) -> None:
+        self.messages = 0
+
+
+class NullBot:
+    def __init__(self, transport: NullTransport, user: Any) -> None:
+        self.transport = transport
+        self.user = user
+        self.id = user.id
+
+    @property
+    async def me(self) -> Any:
+        return self.user
+
+    async def send_message(self, *args: Any, **kwargs: Any) -> None:
+        self.transport.messages += 1
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        async def drop(*args: Any, **kwargs: Any) -> None:
+            return None
+
+        return drop
+
+
+class NullDatabase:
+    async def fetch(self, *args: Any, **kwargs: Any) -> List[Any]:
+        return []
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        async def drop(*args: Any, **kwargs: Any) -> None:
+            return None
+
+        return drop
+
+
+class NullMessage:
+    """Answer from a simulated player, as handle_answer sees it."""
+
+    def __init__(self, transport: NullTransport, user: Any, text: str) -> None:
+        self.transport = transport
+        self.from_user = user
+        self.text = text
+        self.reply_to_message = None
+
+    async def reply(self, *args: Any, **kwargs: Any) -> None:
+        self.transport.messages += 1
+
+
+def install_null_transport() -> NullTransport:
+    """Replace the bots and the database wherever the package imported them."""
+    from aiogram import types
+
+    import on9wordchainbot
+
+    transport = NullTransport()
+    replacements = {
+        id(on9wordchainbot.bot): NullBot(transport, types.User(id=BOT_USER_ID, is_bot=True, first_name="Bot")),
+        id(on9wordchainbot.on9bot): NullBot(transport, types.User(id=VP_USER_ID, is_bot=True, first_name="On9Bot")),
+        id(on9wordchainbot.db): NullDatabase()
+    }
+    for name, module in list(sys.modules.items()):
+        if name == "on9wordchainbot" or name.startswith("on9wordchainbot."):
+            for attr in ("bot", "on9bot", "db"):
+                value = getattr(module, attr, None)
+                if value is not None and id(value) in replacements:
+                    setattr(module, attr, replacements[id(value)])
+    return transport
+
+
+def game_modes() -> Dict[str, Any]:
+    """Game classes by their start command without "start", e.g. classic or elim."""
+    from on9wordchainbot.models import GAME_MODES
+
+    return {cls.command[len("start"):]: cls for cls in GAME_MODES}
+
+
+def simulated(game_class: Any) -> Any:
+    """Subclass of game_class recording what the simulator reports and playing the scripted players' turns."""
+    from on9wordchainbot.constants import GameState
+    from on9wordchainbot.utils import count_words
+
+    class SimulatedGame(game_class):
+        def setup_simulation(self, options: argparse.Namespace, transport: NullTransport) -> None:
+            self.options = options
+            self.transport = transport
+            self.depth = 0  # Engine calls in progress, only the outermost is timed
+            self.engine_ns = 0
+            self.turn_mark_ns = 0
+            self.turn_serial = 0
+            self.turn_ns: List[int] = []
+            self.vp_ns: List[int] = []
+            self.setup_ns: Optional[int] = None
+            self.dead_ends = 0
+            self.rejected = 0
+            self.start_clock: Optional[float] = None
+            self.capped = False
+
+        def time_engine(self, t: int) -> None:
+            self.depth -= 1
+            if not self.depth:
+                self.engine_ns += time.thread_time_ns() - t
+
+        async def running_initialization(self) -> None:
+            self.depth += 1
+            t = time.thread_time_ns()
+            try:
+                await super().running_initialization()
+            finally:
+                self.time_engine(t)
+
+        def count_answers(self) -> Any:
+            self.depth += 1
+            t = time.thread_time_ns()
+            try:
+                return super().count_answers()
+            finally:
+                self.time_engine(t)
+
+        async def send_turn_message(self) -> None:
+            self.depth += 1
+            t = time.thread_time_ns()
+            try:
+                await super().send_turn_message()
+            finally:
+                self.time_engine(t)
+            # Once the engine is done with the turn, as in a group the players would read the message first
+            asyncio.get_running_loop().call_soon(self.start_turn)
+
+        async def running_phase_tick(self) -> bool:
+            self.depth += 1
+            t = time.thread_time_ns()
+            try:
+                return await super().running_phase_tick()
+            finally:
+                self.time_engine(t)
+
+        async def handle_answer(self, message: Any) -> None:
+            self.depth += 1
+            t = time.thread_time_ns()
+            try:
+                await super().handle_answer(message)
+            finally:
+                self.time_engine(t)
+
+        async def update_db(self) -> None:
+            # Nothing is recorded, simulated players have no Telegram accounts to record them by
+            pass
+
+        def vp_search(self) -> Callable[[], Optional[str]]:
+            # Copying the game state for the search counts towards it
+            t = time.thread_time_ns()
+            search = super().vp_search()
+            copy_ns = time.thread_time_ns() - t
+
+            def timed() -> Optional[str]:
+                t = time.thread_time_ns()
+                try:
+                    return search()
+                finally:
+                    self.vp_ns.append(copy_ns + time.thread_time_ns() - t)
+
+            return timed
+
+        def start_turn(self) -> None:
+            if self.state != GameState.RUNNING or not self.accepting_answers:
+                return
+            # Engine time since the previous turn started, the first turn's being the setup
+            if self.setup_ns is None:
+                self.setup_ns = self.engine_ns
+                self.start_clock = asyncio.get_running_loop().time()
+            else:
+                self.turn_ns.append(self.engine_ns - self.turn_mark_ns)
+            self.turn_mark_ns = self.engine_ns
+            self.turn_serial += 1
+
+            if self.turns >= self.options.max_turns:
+                self.capped = True
+                self.state = GameState.KILLGAME
+                self.wake()
+                return
+            n = self.possible_answers()
+            if n is None:
+                n = count_words(**self.answer_constraints(), snapshot=self.snapshot, limit=1)
+            if n == 0:
+                self.dead_ends += 1
+                return
+
+            player = self.players_in_game[0]
+            if player.is_vp or random.random() >= self.options.skill:
+                return  # The virtual player answers by itself, a scripted one that misses lets the time run out
+            word = self.get_random_valid_answer()
+            if not word:
+                return
+            delay = random.uniform(*self.options.think)
+            if delay >= self.time_left:
+                return
+            asyncio.create_task(self.answer(player, word, delay, self.turn_serial))
+
+        async def answer(self, player: Any, word: str, delay: float, serial: int) -> None:
+            from aiogram import types
+
+            user = types.User(id=player.user_id, is_bot=False, first_name=str(player.user_id))
+            if random.random() < self.options.mistakes:
+                # The current word has been used, so it is rejected
+                await asyncio.sleep(delay / 2)
+                if self.answerable(player, serial):
+                    self.rejected += 1
+                    await self.handle_answer(NullMessage(self.transport, user, self.current_word.capitalize()))
+                delay /= 2
+            await asyncio.sleep(delay)
+            # As the answer handler checks before passing a message on
+            if self.answerable(player, serial):
+                await self.handle_answer(NullMessage(self.transport, user, word.capitalize()))
+
+        def answerable(self, player: Any, serial: int) -> bool:
+            return (
+                serial == self.turn_serial and bool(self.players_in_game) and self.players_in_game[0] is player
+                and not self.answered and self.accepting_answers
+            )
+
+    SimulatedGame.__name__ = SimulatedGame.__qualname__ = f"Simulated{game_class.__name__}"
+    return SimulatedGame
+
+
+async def play_game(
+    game_class: Any, group_id: int, options: argparse.Namespace, transport: NullTransport
+) -> Dict[str, Any]:
+    from aiogram import types
+
+    from on9wordchainbot import GlobalState
+    from on9wordchainbot.models import Player
+    from on9wordchainbot.words import GroupOverlays
+
+    game = game_class(group_id)
+    game.setup_simulation(options, transport)
+    n = max(options.players, game.min_players)
+    users = [types.User(id=FIRST_PLAYER_ID + i, is_bot=False, first_name=f"Player {i}") for i in range(n)]
+    game.players = [Player(user) for user in users]
+    if options.vp:
+        game.players[-1] = await Player.vp()
+        game.vp_tier = options.vp
+    # Start as soon as the joining phase is checked
+    game.time_left = 0
+    GlobalState.games[group_id] = game
+    messages = transport.messages
+    error = None
+    try:
+        await game.main_loop(NullMessage(transport, users[0], "/start"))
+    except Exception as e:
+        error = f"{e.__class__.__name__}: {e}"
+    finally:
+        GlobalState.games.pop(group_id, None)
+        GroupOverlays.loaded.pop(group_id, None)
+
+    loop = asyncio.get_running_loop()
+    return {
+        "turns": game.turns,
+        "virtual_s": loop.time() - game.start_clock if game.start_clock is not None else 0.0,
+        "rounds": getattr(game, "round", None),
+        "turn_ns": game.turn_ns,
+        "vp_ns": game.vp_ns,
+        "setup_ns": game.setup_ns or 0,
+        "dead_ends": game.dead_ends,
+        "turn_starts": len(game.turn_ns) + (game.setup_ns is not None),
+        "rejected": game.rejected,
+        "messages": transport.messages - messages,
+        "vp_won": bool(options.vp and len(game.players_in_game) == 1 and game.players_in_game[0].is_vp),
+        "capped": game.capped,
+        "error": error
+    }
+
+
+def run_game(game_class: Any, group_id: int, options: argparse.Namespace, transport: NullTransport) -> Dict[str, Any]:
+    """Play one game to the end on a fresh virtual clock loop."""
+    loop = VirtualClockLoop()
+    try:
+        result = loop.run_until_complete(play_game(game_class, group_id, options, transport))
+        # Let the database updates and cancelled virtual player turns finish
+        pending = asyncio.all_tasks(loop)
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        return result
+    finally:
+        loop.close()
+
+
+# Per worker process
+_transport: Optional[NullTransport] = None
+
+
+def init_worker(word_file: str, artifact_file: str) -> None:
+    global _transport
+
+    from on9wordchainbot import words as words_module
+    from on9wordchainbot.words import Words
+
+    logging.getLogger().setLevel(logging.WARNING)
+    words_module.WORD_FILE = word_file
+    words_module.ARTIFACT_FILE = artifact_file
+    # Maps the artifact compiled by the parent, or keeps the word list inherited from it
+    asyncio.run(Words.update())
+    _transport = install_null_transport()
+
+
+def run_batch(mode: str, first_game: int, n: int, options: argparse.Namespace) -> List[Dict[str, Any]]:
+    random.seed(options.seed * 1_000_003 + first_game)
+    game_class = simulated(game_modes()[mode])
+    return [run_game(game_class, -1 - first_game - i, options, _transport) for i in range(n)]
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    a = np.asarray(values, dtype=np.float64)
+    return {
+        "mean": round(float(a.mean()), 2),
+        "p10": round(float(np.percentile(a, 10)), 2),
+        "p50": round(float(np.percentile(a, 50)), 2),
+        "p90": round(float(np.percentile(a, 90)), 2),
+        "max": round(float(a.max()), 2)
+    }
+
+
+def aggregate(mode: str, games: List[Dict[str, Any]], wall_s: float) -> Dict[str, Any]:
+    turn_starts = sum(g["turn_starts"] for g in games)
+    dead_ends = sum(g["dead_ends"] for g in games)
+    turn_ns = [t for g in games for t in g["turn_ns"]]
+    vp_ns = [t for g in games for t in g["vp_ns"]]
+    result: Dict[str, Any] = {
+        "mode": mode,
+        "games": len(games),
+        "errors": sum(g["error"] is not None for g in games),
+        "capped": sum(g["capped"] for g in games),
+        "games_per_s": round(len(games) / wall_s, 1) if wall_s else None,
+        "turns": percentiles([g["turns"] for g in games]),
+        "game_minutes": percentiles([g["virtual_s"] / 60 for g in games]),
+        "dead_end_turn_rate": round(dead_ends / turn_starts, 5) if turn_starts else 0.0,
+        "games_with_dead_end": round(sum(g["dead_ends"] > 0 for g in games) / len(games), 4) if games else 0.0,
+        "messages_per_game": round(float(np.mean([g["messages"] for g in games])), 1) if games else 0.0,
+        "setup": summarize([g["setup_ns"] for g in games]) if games else {},
+        "turn_cpu": summarize(turn_ns) if turn_ns else {},
+        "vp_answer_cpu": summarize(vp_ns) if vp_ns else {}
+    }
+    if games and games[0]["rounds"] is not None:
+        result["rounds"] = percentiles([g["rounds"] for g in games])
+    if any(g["vp_won"] for g in games):
+        result["vp_win_rate"] = round(sum(g["vp_won"] for g in games) / len(games), 4)
+    errors = sorted({g["error"] for g in games if g["error"]})
+    if errors:
+        result["error_samples"] = errors[:5]
+    return result
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    for r in results["modes"]:
+        turns, cpu = r["turns"], r["turn_cpu"]
+        print(
+            f"{r['mode']:8} {r['games']:>6} games {r['games_per_s']:>8} games/s  "
+            f"turns p50 {turns.get('p50')} p90 {turns.get('p90')}  "
+            f"minutes p50 {r['game_minutes'].get('p50')}  dead ends {r['dead_end_turn_rate']:.2%} of turns  "
+            f"turn CPU p50 {cpu.get('p50_us')}us p99 {cpu.get('p99_us')}us"
+            + (f"  errors {r['errors']}" if r["errors"] else ""),
+            file=sys.stderr
+        )
+
+
+def parse_range(s: str) -> Tuple[float, float]:
+    lo, hi = (float(x) for x in s.split(","))
+    return lo, hi
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="all", help="comma separated modes, e.g. classic,elim (default: all)")
+    parser.add_argument("--games", type=int, default=1000, help="games per mode (default: 1000)")
+    parser.add_argument("--players", type=int, default=4, help="players per game, at least the mode's minimum")
+    parser.add_argument("--skill", type=float, default=0.95, help="chance of a scripted player answering a turn")
+    parser.add_argument(
+        "--think", type=parse_range, default=(2.0, 12.0), help="scripted players' thinking seconds, as min,max"
+    )
+    parser.add_argument("--mistakes", type=float, default=0.1, help="chance of sending a used word first")
+    parser.add_argument("--vp", choices=["easy", "normal", "hard"], help="add On9Bot playing at this tier")
+    parser.add_argument("--max-turns", type=int, default=2000, help="games are stopped after this many turns")
+    parser.add_argument("--words", help="word list to play with (default: words.txt)")
+    parser.add_argument("--synthetic", type=int, help="play with this many synthetic words instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the JSON results to")
+    options = parser.parse_args()
+
+    from on9wordchainbot import words as words_module
+    from on9wordchainbot.words import Words
+
+    modes = list(game_modes()) if options.modes == "all" else options.modes.split(",")
+    unknown = [m for m in modes if m not in game_modes()]
+    if unknown:
+        parser.error(f"unknown modes {', '.join(unknown)}, choose from {', '.join(game_modes())}")
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {k: v for k, v in vars(options).items() if k != "output"}
+        },
+        "modes": []
+    }
+    logging.getLogger().setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Work on a copy so that neither the word list nor its compiled artifact in the package is touched
+        word_file = os.path.join(tmp_dir, "words.txt")
+        artifact_file = os.path.join(tmp_dir, "words.bin")
+        if options.synthetic:
+            print(f"Generating {options.synthetic} synthetic words", file=sys.stderr)
+            generate_word_list(word_file, options.synthetic, options.seed)
+        else:
+            shutil.copyfile(options.words or REAL_WORD_FILE, word_file)
+        words_module.WORD_FILE = word_file
+        words_module.ARTIFACT_FILE = artifact_file
+        # Compiled once here, the workers map it
+        asyncio.run(Words.update())
+        results["meta"]["words"] = Words.snapshot.count
+
+        with ProcessPoolExecutor(options.workers, initializer=init_worker, initargs=(word_file, artifact_file)) as pool:
+            for mode in modes:
+                t = time.perf_counter()
+                batches = [
+                    pool.submit(run_batch, mode, first, min(BATCH_SIZE, options.games - first), options)
+                    for first in range(0, options.games, BATCH_SIZE)
+                ]
+                games = [g for batch in batches for g in batch.result()]
+                results["modes"].append(aggregate(mode, games, time.perf_counter() - t))
+                print_summary({"modes": results["modes"][-1:]})
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -95,7 +95,7 @@ async def set_bot_commands():
         # Admin commands
         types.BotCommand("forcestart", "Force start the game (admin only)"),
         types.BotCommand("killgame", "End the current game (admin only)"),
-        types.BotCommand("addvp", "Add a virtual player"),
+        types.BotCommand("addvp", "Add a virtual player, optionally easy or hard"),
         types.BotCommand("remvp", "Remove a virtual player"),
         types.BotCommand("extend", "Extend joining time"),
         types.BotCommand("forceskip", "Skip current player's turn (admin only)")
@@ -105,6 +105,9 @@ async def set_bot_commands():
 
 async def on_startup(dp):
     """Run this when bot starts."""
+    from .words import Words
+
+    await Words.load()
     await set_bot_commands()
     logger.info("Bot has been started!")
 
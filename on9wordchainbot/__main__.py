@@ -1,4 +1,3 @@
-import asyncio
 import random
 import time
 from decimal import ROUND_HALF_UP, getcontext
@@ -8,7 +7,7 @@ from periodic import Periodic
 
 from on9wordchainbot import dp, loop, session
 from on9wordchainbot.utils import send_admin_group
-from on9wordchainbot.words import Words
+from on9wordchainbot.words import GroupOverlays, Words
 
 # Import all handlers to register them
 from on9wordchainbot.handlers import game_handler, gameplay, info, stats, wordlist
@@ -21,12 +20,20 @@ async def on_startup(_) -> None:
     # Notify admin group
     await send_admin_group("Bot starting.")
 
-    await Words.update()
+    await Words.load()
 
     # Update word list every 3 hours
     task = Periodic(3 * 60 * 60, Words.update)
     await task.start()
 
+    # Fold accumulated word additions into the compiled word list daily
+    compaction_task = Periodic(24 * 60 * 60, Words.compact)
+    await compaction_task.start()
+
+    # Drop word overlays of groups that stopped playing
+    overlay_eviction_task = Periodic(60 * 60, GroupOverlays.evict_idle)
+    await overlay_eviction_task.start()
+
 
 async def on_shutdown(_) -> None:
     # Notify admin group
@@ -34,6 +34,8 @@ class GameState:
 class GameSettings:
     JOINING_PHASE_SECONDS = 60
     MAX_JOINING_PHASE_SECONDS = 180
+    # Seconds left in the joining phase at which players are reminded to /join
+    JOINING_REMINDER_SECONDS = (15, 30, 60)
     MIN_PLAYERS = 2
     MAX_PLAYERS = 50
     INCREASED_MAX_PLAYERS = 300
@@ -44,6 +46,18 @@ class GameSettings:
     MAX_WORD_LENGTH_LIMIT = 10
     WORD_LENGTH_LIMIT_INCREASE_PER_LIMIT_CHANGE = 1
     TURNS_BETWEEN_LIMITS_CHANGE = 5
+    # Running games keep using the word list they started with when it is reloaded
+    PIN_WORD_LIST = True
+    # Random letter constraints are re-rolled at most this many times a turn
+    # until the turn has at least this many valid answers
+    MIN_POSSIBLE_ANSWERS = 5
+    MAX_CONSTRAINT_REROLLS = 10
+    # Starting words are re-picked at most this many times
+    # until at least this many words start with their last letter
+    MIN_START_WORD_FOLLOWERS = 100
+    START_WORD_ATTEMPTS = 10
+    # Random answers tried before listing every answer, where some answers are rejected like dead ends
+    ANSWER_SAMPLE_ATTEMPTS = 10
 
     ELIM_JOINING_PHASE_SECONDS = 90
     ELIM_MIN_PLAYERS = 5
@@ -51,3 +65,5 @@ class GameSettings:
     ELIM_INCREASED_MAX_PLAYERS = 50
     ELIM_TURN_SECONDS = 30
     ELIM_MAX_TURN_SCORE = 20
+    # Word length the virtual player aims for in elimination games, by tier
+    ELIM_VP_WORD_LENGTHS = {"easy": 6, "normal": 12, "hard": ELIM_MAX_TURN_SCORE}
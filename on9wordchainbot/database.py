@@ -88,6 +88,14 @@ class Database:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
 
+        CREATE TABLE IF NOT EXISTS groupword (
+            group_id BIGINT NOT NULL,
+            word TEXT NOT NULL,
+            allowed INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (group_id, word)
+        );
+
         -- Create indexes for better performance
         CREATE INDEX IF NOT EXISTS idx_game_group_id ON game(group_id);
         CREATE INDEX IF NOT EXISTS idx_gameplayer_user_id ON gameplayer(user_id);
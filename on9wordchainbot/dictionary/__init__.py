@@ -0,0 +1,40 @@
+from .anagram import AnagramIndex
+from .arena import WordArena
+from .artifact import (SourceFingerprint, build_artifact, compile_word_list, diff_sources, fingerprint,
+                       load_artifact, read_source, write_artifact)
+from .counts import AnswerCounts, BigramAnswerCounts
+from .fuzzy import FuzzyIndex
+from .index import WordIndex, bigram_index, letter_mask
+from .letters import LetterStats
+from .longest import LongestWords
+from .pattern import PositionIndex
+from .strategy import DEFAULT_VP_TIER, VP_TIERS, VPTier
+from .used import UsedWords
+from .wordlist import WordList
+
+__all__ = (
+    "AnagramIndex",
+    "AnswerCounts",
+    "BigramAnswerCounts",
+    "FuzzyIndex",
+    "LetterStats",
+    "LongestWords",
+    "PositionIndex",
+    "WordArena",
+    "WordIndex",
+    "WordList",
+    "UsedWords",
+    "VPTier",
+    "DEFAULT_VP_TIER",
+    "VP_TIERS",
+    "SourceFingerprint",
+    "bigram_index",
+    "build_artifact",
+    "compile_word_list",
+    "diff_sources",
+    "fingerprint",
+    "letter_mask",
+    "load_artifact",
+    "read_source",
+    "write_artifact"
+)
@@ -0,0 +1,57 @@
+import zlib
+from typing import Sequence
+
+import numpy as np
+
+
+def signature(word: str) -> str:
+    """Letters of word in sorted order, shared by all its anagrams."""
+    return "".join(sorted(word))
+
+
+def letter_counts(word: str) -> np.ndarray:
+    """Number of each letter of the alphabet in word."""
+    codes = np.frombuffer(word.encode("utf-32-le"), dtype="<u4").astype(np.int64) - ord("a")
+    return np.bincount(codes[(codes >= 0) & (codes < 26)], minlength=26).astype(np.uint8)
+
+
+class AnagramIndex:
+    """Sorted-letter signatures and letter counts of the words, for anagram lookups.
+
+    ``hashes`` holds the CRC-32 of each word's signature, sorted, with ``ordinals`` the words they came from,
+    so the anagrams of a string are found by binary search rather than a scan.
+    ``letter_counts[i]`` counts each letter of the alphabet in the word of ordinal i,
+    for finding the words that can be spelt with a set of letters.
+    """
+
+    __slots__ = ("hashes", "ordinals", "letter_counts")
+
+    def __init__(self, hashes: np.ndarray, ordinals: np.ndarray, letter_counts: np.ndarray) -> None:
+        self.hashes = hashes
+        self.ordinals = ordinals
+        self.letter_counts = letter_counts
+
+    @classmethod
+    def from_words(cls, words: Sequence[str], lengths: np.ndarray) -> "AnagramIndex":
+        """Index words, which are in ordinal order, with lengths their lengths in characters."""
+        crc32 = zlib.crc32
+        hashes = np.fromiter((crc32(signature(w).encode()) for w in words), dtype=np.uint32, count=len(words))
+        order = np.argsort(hashes, kind="stable")
+
+        # Count every letter of every word in one pass, ignoring other characters
+        codes = np.frombuffer("".join(words).encode("utf-32-le"), dtype="<u4").astype(np.int64) - ord("a")
+        owners = np.repeat(np.arange(len(words), dtype=np.int64), np.asarray(lengths, dtype=np.int64))
+        is_letter = (codes >= 0) & (codes < 26)
+        counts = np.bincount(owners[is_letter] * 26 + codes[is_letter], minlength=len(words) * 26)
+        return cls(hashes[order], order.astype(np.uint32), counts.astype(np.uint8).reshape(len(words), 26))
+
+    @property
+    def nbytes(self) -> int:
+        return self.hashes.nbytes + self.ordinals.nbytes + self.letter_counts.nbytes
+
+    def candidates(self, letters: str) -> np.ndarray:
+        """Ascending ordinals of words that may be anagrams of letters. Includes false positives."""
+        h = zlib.crc32(signature(letters).encode())
+        start = np.searchsorted(self.hashes, h, side="left")
+        end = np.searchsorted(self.hashes, h, side="right")
+        return np.sort(self.ordinals[start:end]).astype(np.int64)
@@ -0,0 +1,161 @@
+from array import array
+from mmap import mmap
+from os.path import commonprefix
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+# Number of words per front-coded block.
+# Larger blocks compress better but make random access scan further.
+BLOCK_SIZE = 16
+
+# Slicing either of these yields bytes, which the binary search compares against directly
+Buffer = Union[bytes, mmap]
+
+
+class WordArena:
+    """Immutable, sorted word list stored as one front-coded byte blob.
+
+    Words are grouped into blocks of ``BLOCK_SIZE``. Every entry is encoded as
+    ``<shared prefix length><suffix length><suffix>`` relative to the previous word of its block.
+    The first word of a block shares nothing, so each block can be decoded on its own.
+    ``offsets[b]`` is the position of block ``b`` in the blob.
+
+    A word's ordinal is its position in sorted order.
+    """
+
+    __slots__ = ("blob", "offsets", "count")
+
+    def __init__(self, blob: Buffer, offsets: Sequence[int], count: int) -> None:
+        self.blob = blob
+        self.offsets = offsets
+        self.count = count
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "WordArena":
+        # Sorting UTF-8 bytes gives the same order as sorting by code point
+        # Lengths are stored in one byte each, no real word comes close to that
+        encoded = sorted({w.encode() for w in words if 0 < len(w.encode()) < 256})
+
+        blob = bytearray()
+        offsets = array("I")
+        prev = b""
+        for i, word in enumerate(encoded):
+            if i % BLOCK_SIZE == 0:
+                offsets.append(len(blob))
+                shared = 0
+            else:
+                shared = len(commonprefix((prev, word)))
+            suffix = word[shared:]
+            blob.append(shared)
+            blob.append(len(suffix))
+            blob += suffix
+            prev = word
+        return cls(bytes(blob), offsets, len(encoded))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_range(0, self.count)
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.find(word) is not None
+
+    def __getitem__(self, ordinal: int) -> str:
+        if not 0 <= ordinal < self.count:
+            raise IndexError("word ordinal out of range")
+        block, pos = divmod(ordinal, BLOCK_SIZE)
+        for i, word in enumerate(self._iter_block(block)):
+            if i == pos:
+                return word.decode()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.blob) + len(self.offsets) * 4
+
+    def _head(self, block: int) -> bytes:
+        pos = self.offsets[block]
+        return bytes(self.blob[pos + 2:pos + 2 + self.blob[pos + 1]])
+
+    def _iter_block(self, block: int) -> Iterator[bytes]:
+        blob = self.blob
+        pos = self.offsets[block]
+        word = b""
+        for _ in range(min(BLOCK_SIZE, self.count - block * BLOCK_SIZE)):
+            shared = blob[pos]
+            end = pos + 2 + blob[pos + 1]
+            word = word[:shared] + blob[pos + 2:end]
+            pos = end
+            yield word
+
+    def _locate(self, key: bytes, first_block: int = 0) -> Tuple[int, Optional[bytes]]:
+        # Returns the ordinal of the first word >= key and that word (None if past the end)
+        # Callers that already know the answer lies past some block may pass it as first_block
+        blob, offsets = self.blob, self.offsets
+        lo, hi = first_block, len(offsets)
+        while lo < hi:  # First block whose head is >= key
+            mid = (lo + hi) // 2
+            pos = offsets[mid]
+            if blob[pos + 2:pos + 2 + blob[pos + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return 0, self._head(0) if self.count else None
+
+        # Answer lies in the previous block or is the head of block lo
+        ordinal = (lo - 1) * BLOCK_SIZE
+        for word in self._iter_block(lo - 1):
+            if word >= key:
+                return ordinal, word
+            ordinal += 1
+        return ordinal, self._head(lo) if ordinal < self.count else None
+
+    def lower_bound(self, key: bytes, first_block: int = 0) -> int:
+        return self._locate(key, first_block)[0]
+
+    def find(self, word: str) -> Optional[int]:
+        """Ordinal of word, or None if absent."""
+        key = word.encode()
+        ordinal, found = self._locate(key)
+        return ordinal if found == key else None
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Half-open ordinal range [lo, hi) of words starting with prefix."""
+        if not prefix:
+            return 0, self.count
+        key = prefix.encode()
+        # 0xff never appears in UTF-8, so every word with this prefix sorts before key + b"\xff"
+        lo = self.lower_bound(key)
+        return lo, self.lower_bound(key + b"\xff", lo // BLOCK_SIZE)
+
+    def iter_range(self, lo: int, hi: int) -> Iterator[str]:
+        """Lazily yield words with ordinals in [lo, hi) in sorted order."""
+        hi = min(hi, self.count)
+        if lo >= hi:
+            return
+        block, skip = divmod(lo, BLOCK_SIZE)
+        remaining = hi - lo
+        while remaining:
+            for word in self._iter_block(block):
+                if skip:
+                    skip -= 1
+                    continue
+                yield word.decode()
+                remaining -= 1
+                if not remaining:
+                    return
+            block += 1
+
+    def iter_ordinals(self, ordinals: Iterable[int]) -> Iterator[str]:
+        """Lazily yield the words at the given ordinals, which must be in ascending order."""
+        block = -1
+        words = []
+        for ordinal in ordinals:
+            b, pos = divmod(int(ordinal), BLOCK_SIZE)
+            if b != block:  # Decode each block at most once
+                block = b
+                words = list(self._iter_block(block))
+            yield words[pos].decode()
+
+    def starts_with(self, prefix: str) -> Iterator[str]:
+        return self.iter_range(*self.prefix_range(prefix))
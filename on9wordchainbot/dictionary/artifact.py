@@ -0,0 +1,318 @@
+"""Compiled binary form of the word list.
+
+The artifact holds the normalized, sorted arena of words.txt and any extra words compiled in
+(such as accepted word additions folded in by compaction) with its attribute arrays and search indexes,
+laid out so that it can be memory-mapped and used without parsing.
+Processes mapping the same file share its pages through the OS page cache.
+
+Layout (little-endian, sections 8-byte aligned):
+header | block offsets (u32) | first letter starts (i64 x 27) | bigram ranges (i64 x 676 x 2) | lengths (u8) |
+letter masks (u32) | fuzzy variant hashes (u32) | fuzzy variant ordinals (u32) | ordinals by length (u32) |
+length starts (i64 x 257) | position bitmap starts (i64 x 257) | position bitmaps (u8) |
+anagram signature hashes (u32) | anagram ordinals (u32) | letter counts (u8 x 26 per word) |
+suffix ordinals (u32) | last letter starts (i64 x 27) | reversed block offsets (u32) | arena blob | reversed arena blob
+
+Block offsets are absolute positions in the file, so the mapped file itself serves as the blob of both arenas.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from .anagram import AnagramIndex
+from .arena import WordArena
+from .fuzzy import FuzzyIndex
+from .index import BIGRAMS, WordIndex
+from .pattern import MAX_LENGTH, PositionIndex
+from .suffix import SuffixIndex
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"O9WD"
+VERSION = 6
+
+# Magic, format version, word count, block count, blob size, reversed block count, reversed blob size,
+# fuzzy variant count, position bitmap size, source size, source mtime (ns), source SHA-256,
+# CRC-32 of everything after the header
+_HEADER = struct.Struct("<4sHIIQIQIQQQ32sI")
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class _Layout(NamedTuple):
+    # Positions of each section and the total file size
+    offsets: int
+    letter_starts: int
+    bigram_ranges: int
+    lengths: int
+    masks: int
+    hashes: int
+    ordinals: int
+    by_length: int
+    length_starts: int
+    bitmap_starts: int
+    bitmaps: int
+    signatures: int
+    signature_ordinals: int
+    letter_counts: int
+    suffix_ordinals: int
+    last_letter_starts: int
+    reversed_offsets: int
+    blob: int
+    reversed_blob: int
+    size: int
+
+
+def _layout(
+    count: int, blocks: int, blob_size: int, reversed_blocks: int, reversed_blob_size: int, variants: int,
+    bitmap_size: int
+) -> _Layout:
+    offsets_pos = _align(_HEADER.size)
+    letter_starts_pos = _align(offsets_pos + blocks * 4)
+    bigram_ranges_pos = letter_starts_pos + 27 * 8
+    lengths_pos = bigram_ranges_pos + len(BIGRAMS) * 2 * 8
+    masks_pos = _align(lengths_pos + count)
+    hashes_pos = masks_pos + count * 4
+    ordinals_pos = hashes_pos + variants * 4
+    by_length_pos = ordinals_pos + variants * 4
+    length_starts_pos = _align(by_length_pos + count * 4)
+    bitmap_starts_pos = length_starts_pos + (MAX_LENGTH + 2) * 8
+    bitmaps_pos = bitmap_starts_pos + (MAX_LENGTH + 2) * 8
+    signatures_pos = _align(bitmaps_pos + bitmap_size)
+    signature_ordinals_pos = signatures_pos + count * 4
+    letter_counts_pos = signature_ordinals_pos + count * 4
+    suffix_ordinals_pos = _align(letter_counts_pos + count * 26)
+    last_letter_starts_pos = _align(suffix_ordinals_pos + count * 4)
+    reversed_offsets_pos = last_letter_starts_pos + 27 * 8
+    blob_pos = reversed_offsets_pos + reversed_blocks * 4
+    reversed_blob_pos = blob_pos + blob_size
+    return _Layout(
+        offsets_pos, letter_starts_pos, bigram_ranges_pos, lengths_pos, masks_pos, hashes_pos, ordinals_pos,
+        by_length_pos, length_starts_pos, bitmap_starts_pos, bitmaps_pos, signatures_pos, signature_ordinals_pos,
+        letter_counts_pos, suffix_ordinals_pos, last_letter_starts_pos, reversed_offsets_pos, blob_pos,
+        reversed_blob_pos, reversed_blob_pos + reversed_blob_size
+    )
+
+
+def file_digest(path: str) -> bytes:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+class SourceFingerprint(NamedTuple):
+    size: int
+    mtime_ns: int
+    digest: bytes
+
+
+def fingerprint(path: str, known: Optional[SourceFingerprint] = None) -> SourceFingerprint:
+    """Fingerprint of the file at path. Hashing is skipped if its size and mtime match known."""
+    stat = os.stat(path)
+    if known and (stat.st_size, stat.st_mtime_ns) == (known.size, known.mtime_ns):
+        return known
+    return SourceFingerprint(stat.st_size, stat.st_mtime_ns, file_digest(path))
+
+
+def read_source(path: str, known: Optional[SourceFingerprint] = None) -> Tuple[SourceFingerprint, Optional[bytes]]:
+    """Fingerprint and contents of the file at path, taken from a single read so that they agree.
+    Reading is skipped, and the contents None, if its size and mtime match known.
+    """
+    stat = os.stat(path)
+    if known and (stat.st_size, stat.st_mtime_ns) == (known.size, known.mtime_ns):
+        return known, None
+    with open(path, "rb") as f:
+        text = f.read()
+    return SourceFingerprint(stat.st_size, stat.st_mtime_ns, hashlib.sha256(text).digest()), text
+
+
+def _source_words(text: bytes) -> Set[str]:
+    # Normalized as compile_word_list does
+    words = set(map(str.strip, text.decode("utf-8").lower().split("\n")))
+    words.discard("")
+    return words
+
+
+def diff_sources(old: bytes, new: bytes) -> Tuple[List[str], List[str]]:
+    """Words added and removed between two versions of the contents of a text word list."""
+    old_words = _source_words(old)
+    new_words = _source_words(new)
+    return sorted(new_words - old_words), sorted(old_words - new_words)
+
+
+def read_source_fingerprint(path: str) -> Optional[SourceFingerprint]:
+    """Fingerprint of the source the artifact at path was compiled from, or None if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, version, _, _, _, _, _, _, _, src_size, src_mtime_ns, src_digest, _ = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return SourceFingerprint(src_size, src_mtime_ns, src_digest)
+
+
+def write_artifact(path: str, index: WordIndex, source: SourceFingerprint) -> None:
+    """Write index to path, recording the source it was built from. The file is replaced atomically."""
+    arena = index.arena
+    fuzzy = index.fuzzy
+    positions = index.positions
+    anagrams = index.anagrams
+    suffixes = index.suffixes
+    blocks = len(arena.offsets)
+    reversed_blocks = len(suffixes.arena.offsets)
+    variants = len(fuzzy.hashes)
+    bitmap_size = len(positions.bitmaps)
+    layout = _layout(
+        len(arena), blocks, len(arena.blob), reversed_blocks, len(suffixes.arena.blob), variants, bitmap_size
+    )
+
+    buf = bytearray(layout.size)
+    buf[layout.offsets:layout.offsets + blocks * 4] = (
+        np.asarray(arena.offsets, dtype=np.int64) + layout.blob
+    ).astype("<u4").tobytes()
+    buf[layout.letter_starts:layout.bigram_ranges] = np.asarray(index.letter_starts, dtype="<i8").tobytes()
+    buf[layout.bigram_ranges:layout.lengths] = np.asarray(index.bigram_ranges, dtype="<i8").tobytes()
+    buf[layout.lengths:layout.lengths + len(arena)] = np.asarray(index.lengths, dtype=np.uint8).tobytes()
+    buf[layout.masks:layout.hashes] = np.asarray(index.masks, dtype="<u4").tobytes()
+    buf[layout.hashes:layout.ordinals] = np.asarray(fuzzy.hashes, dtype="<u4").tobytes()
+    buf[layout.ordinals:layout.by_length] = np.asarray(fuzzy.ordinals, dtype="<u4").tobytes()
+    buf[layout.by_length:layout.by_length + len(arena) * 4] = np.asarray(positions.by_length, dtype="<u4").tobytes()
+    buf[layout.length_starts:layout.bitmap_starts] = np.asarray(positions.length_starts, dtype="<i8").tobytes()
+    buf[layout.bitmap_starts:layout.bitmaps] = np.asarray(positions.bitmap_starts, dtype="<i8").tobytes()
+    buf[layout.bitmaps:layout.bitmaps + bitmap_size] = np.asarray(positions.bitmaps, dtype=np.uint8).tobytes()
+    buf[layout.signatures:layout.signature_ordinals] = np.asarray(anagrams.hashes, dtype="<u4").tobytes()
+    buf[layout.signature_ordinals:layout.letter_counts] = np.asarray(anagrams.ordinals, dtype="<u4").tobytes()
+    buf[layout.letter_counts:layout.letter_counts + len(arena) * 26] = np.asarray(
+        anagrams.letter_counts, dtype=np.uint8
+    ).tobytes()
+    buf[layout.suffix_ordinals:layout.suffix_ordinals + len(arena) * 4] = np.asarray(
+        suffixes.ordinals, dtype="<u4"
+    ).tobytes()
+    buf[layout.last_letter_starts:layout.reversed_offsets] = np.asarray(suffixes.letter_starts, dtype="<i8").tobytes()
+    buf[layout.reversed_offsets:layout.blob] = (
+        np.asarray(suffixes.arena.offsets, dtype=np.int64) + layout.reversed_blob
+    ).astype("<u4").tobytes()
+    buf[layout.blob:layout.reversed_blob] = arena.blob
+    buf[layout.reversed_blob:] = suffixes.arena.blob
+
+    buf[:_HEADER.size] = _HEADER.pack(
+        MAGIC, VERSION, len(arena), blocks, len(arena.blob), reversed_blocks, len(suffixes.arena.blob), variants,
+        bitmap_size,
+        source.size, source.mtime_ns, source.digest,
+        zlib.crc32(memoryview(buf)[_HEADER.size:])
+    )
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buf)
+    # Processes still mapping the old file keep their pages until they reload
+    os.replace(tmp_path, path)
+
+
+def load_artifact(path: str, source_path: Optional[str]) -> Optional[WordIndex]:
+    """Memory-map the artifact at path.
+
+    Returns None if it is missing, corrupt, of another format version or older than source_path.
+    Freshness is not checked if source_path is None.
+    """
+    if sys.byteorder != "little":  # Arrays are mapped as they are stored
+        return None
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # Missing or empty
+        return None
+
+    if len(mm) < _HEADER.size:
+        return None
+    (
+        magic, version, count, blocks, blob_size, reversed_blocks, reversed_blob_size, variants, bitmap_size,
+        src_size, src_mtime_ns, src_digest, crc
+    ) = _HEADER.unpack(mm[:_HEADER.size])
+    if magic != MAGIC or version != VERSION:
+        return None
+    layout = _layout(count, blocks, blob_size, reversed_blocks, reversed_blob_size, variants, bitmap_size)
+    if len(mm) != layout.size or zlib.crc32(memoryview(mm)[_HEADER.size:]) != crc:
+        logger.warning(f"Dictionary artifact {path} is corrupt")
+        return None
+
+    # A missing source leaves the artifact as the only copy of the word list
+    if source_path and os.path.exists(source_path):
+        stat = os.stat(source_path)
+        if (stat.st_size, stat.st_mtime_ns) != (src_size, src_mtime_ns) and file_digest(source_path) != src_digest:
+            return None
+
+    arena = WordArena(mm, memoryview(mm)[layout.offsets:layout.offsets + blocks * 4].cast("I"), count)
+    return WordIndex(
+        arena,
+        np.frombuffer(mm, dtype=np.uint8, count=count, offset=layout.lengths),
+        np.frombuffer(mm, dtype="<u4", count=count, offset=layout.masks),
+        np.frombuffer(mm, dtype="<i8", count=27, offset=layout.letter_starts),
+        np.frombuffer(mm, dtype="<i8", count=len(BIGRAMS) * 2, offset=layout.bigram_ranges).reshape(len(BIGRAMS), 2),
+        SuffixIndex(
+            WordArena(
+                mm,
+                memoryview(mm)[layout.reversed_offsets:layout.reversed_offsets + reversed_blocks * 4].cast("I"),
+                count
+            ),
+            np.frombuffer(mm, dtype="<u4", count=count, offset=layout.suffix_ordinals),
+            np.frombuffer(mm, dtype="<i8", count=27, offset=layout.last_letter_starts)
+        ),
+        FuzzyIndex(
+            np.frombuffer(mm, dtype="<u4", count=variants, offset=layout.hashes),
+            np.frombuffer(mm, dtype="<u4", count=variants, offset=layout.ordinals)
+        ),
+        PositionIndex(
+            np.frombuffer(mm, dtype="<u4", count=count, offset=layout.by_length),
+            np.frombuffer(mm, dtype="<i8", count=MAX_LENGTH + 2, offset=layout.length_starts),
+            np.frombuffer(mm, dtype="<i8", count=MAX_LENGTH + 2, offset=layout.bitmap_starts),
+            np.frombuffer(mm, dtype=np.uint8, count=bitmap_size, offset=layout.bitmaps)
+        ),
+        AnagramIndex(
+            np.frombuffer(mm, dtype="<u4", count=count, offset=layout.signatures),
+            np.frombuffer(mm, dtype="<u4", count=count, offset=layout.signature_ordinals),
+            np.frombuffer(mm, dtype=np.uint8, count=count * 26, offset=layout.letter_counts).reshape(count, 26)
+        )
+    )
+
+
+def compile_word_list(source_path: str, path: str, extra_words: Iterable[str] = ()) -> WordIndex:
+    """Parse the text word list at source_path, add extra_words and write the artifact to path."""
+    # Fingerprint first so that changes made while parsing leave the artifact stale
+    source = fingerprint(source_path)
+    with open(source_path, encoding="utf-8") as f:
+        words = {word.strip().lower() for word in f if word.strip()}
+    words.update(extra_words)
+    index = WordIndex.from_words(words)
+    write_artifact(path, index, source)
+    return index
+
+
+def build_artifact(source_path: str, path: str, extra_words: Iterable[str] = ()) -> SourceFingerprint:
+    """compile_word_list for worker processes, returning the source fingerprint rather than the whole index."""
+    compile_word_list(source_path, path, extra_words)
+    return read_source_fingerprint(path)
+
+
+if __name__ == "__main__":
+    # python -m on9wordchainbot.dictionary.artifact [words.txt] [words.bin]
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(package_dir, "words.txt")
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + ".bin"
+    compiled = compile_word_list(source, target)
+    print(f"Compiled {len(compiled)} words from {source} into {target} ({os.path.getsize(target)} bytes)")
@@ -0,0 +1,122 @@
+from string import ascii_lowercase
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .index import BIGRAMS, bigram_index, letter_mask
+from .used import UsedWords
+from .wordlist import WordList
+
+# Words at least this long share the last length bucket, so minimum lengths must stay below it
+LENGTH_BUCKETS = 32
+
+
+class AnswerCounts:
+    """Numbers of unused valid answers by first letter, or last letter if ``by_last_letter``,
+    for a game's minimum word length.
+
+    ``histogram[i, n]`` is the number of unused valid words starting with the i-th letter of length n
+    (or at least n in the last bucket), and ``remaining[i]`` those at least ``min_len`` letters long.
+    Using a word and raising the minimum length update both without scanning the word list.
+    """
+
+    __slots__ = ("histogram", "remaining", "min_len", "banned", "by_last_letter")
+
+    def __init__(self, histogram: np.ndarray, min_len: int, banned: int = 0, by_last_letter: bool = False) -> None:
+        self.histogram = histogram
+        self.min_len = min_len
+        self.remaining = histogram[:, min_len:].sum(axis=1)
+        self.banned = banned
+        self.by_last_letter = by_last_letter
+
+    @classmethod
+    def from_words(
+        cls,
+        words: WordList,
+        min_len: int = 1,
+        banned_letters: Optional[Iterable[str]] = None,
+        exclude: Optional[UsedWords] = None,
+        by_last_letter: bool = False
+    ) -> "AnswerCounts":
+        """Count the words without banned letters and not in exclude."""
+        histogram = np.zeros((26, LENGTH_BUCKETS), dtype=np.int64)
+        for i, letter in enumerate(ascii_lowercase):
+            affix = dict(suffix=letter) if by_last_letter else dict(prefix=letter)
+            ordinals = words.candidates(**affix, banned_letters=banned_letters, exclude=exclude)
+            lengths = np.minimum(words.lengths_of(ordinals), LENGTH_BUCKETS - 1)
+            histogram[i] = np.bincount(lengths, minlength=LENGTH_BUCKETS)
+        return cls(histogram, min_len, letter_mask(banned_letters or ()), by_last_letter)
+
+    def _index(self, key: str) -> int:
+        # Row of the histogram for key, -1 if none
+        i = ord(key) - ord("a") if len(key) == 1 else -1
+        return i if 0 <= i < 26 else -1
+
+    def _key_of(self, word: str) -> str:
+        return word[-1] if self.by_last_letter else word[0]
+
+    def remaining_for(self, key: str, min_len: Optional[int] = None) -> int:
+        """Number of unused valid answers starting (or ending) with letter key.
+        At least min_len letters long if given, rather than the current minimum length.
+        """
+        i = self._index(key)
+        if i < 0:
+            return 0
+        if min_len is None or min_len == self.min_len:
+            return int(self.remaining[i])
+        return int(self.histogram[i, min(min_len, LENGTH_BUCKETS - 1):].sum())
+
+    def remaining_at(self, min_len: int) -> np.ndarray:
+        """Numbers of unused valid answers at least min_len letters long, by key."""
+        return self.histogram[:, min(min_len, LENGTH_BUCKETS - 1):].sum(axis=1)
+
+    def use(self, word: str) -> None:
+        """Count word, a valid answer not used before, as used."""
+        i = self._index(self._key_of(word))
+        if i < 0 or letter_mask(word) & self.banned:
+            return
+        self.histogram[i, min(len(word), LENGTH_BUCKETS - 1)] -= 1
+        if len(word) >= self.min_len:
+            self.remaining[i] -= 1
+
+    def copy(self) -> "AnswerCounts":
+        """Independent copy, such as for a search in another thread while the game goes on."""
+        return type(self)(self.histogram.copy(), self.min_len, self.banned, self.by_last_letter)
+
+    def set_min_len(self, min_len: int) -> None:
+        if min_len > self.min_len:
+            self.remaining -= self.histogram[:, self.min_len:min_len].sum(axis=1)
+        elif min_len < self.min_len:
+            self.remaining += self.histogram[:, min_len:self.min_len].sum(axis=1)
+        self.min_len = min_len
+
+
+class BigramAnswerCounts(AnswerCounts):
+    """AnswerCounts by first two letters, ``histogram[i]`` counting the words starting with the i-th of BIGRAMS."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_words(
+        cls,
+        words: WordList,
+        min_len: int = 1,
+        banned_letters: Optional[Iterable[str]] = None,
+        exclude: Optional[UsedWords] = None
+    ) -> "BigramAnswerCounts":
+        """Count the words without banned letters and not in exclude."""
+        # One pass over every word, as a query per bigram would scan the added words 676 times
+        ordinals = words.candidates(banned_letters=banned_letters, exclude=exclude)
+        bigrams = words.bigrams_of(ordinals)
+        lengths = np.minimum(words.lengths_of(ordinals), LENGTH_BUCKETS - 1).astype(np.int64)
+        counted = bigrams >= 0
+        histogram = np.bincount(
+            bigrams[counted] * LENGTH_BUCKETS + lengths[counted], minlength=len(BIGRAMS) * LENGTH_BUCKETS
+        ).reshape(len(BIGRAMS), LENGTH_BUCKETS)
+        return cls(histogram.astype(np.int64), min_len, letter_mask(banned_letters or ()))
+
+    def _index(self, key: str) -> int:
+        return bigram_index(key)
+
+    def _key_of(self, word: str) -> str:
+        return word[:2]
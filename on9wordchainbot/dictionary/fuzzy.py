@@ -0,0 +1,72 @@
+import zlib
+from typing import Iterator
+
+import numpy as np
+
+from .arena import WordArena
+
+
+def delete_variants(word: bytes) -> Iterator[bytes]:
+    """word and every string made by deleting one of its characters."""
+    yield word
+    for i in range(len(word)):
+        yield word[:i] + word[i + 1:]
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Whether a and b differ by at most one insertion, deletion, substitution or adjacent transposition."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return (
+            a[i + 1:] == b[i + 1:]  # Substitution
+            or a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:]  # Transposition
+        )
+    if len(a) > len(b):
+        a, b = b, a
+    return a[i:] == b[i + 1:]  # Insertion
+
+
+class FuzzyIndex:
+    """Symmetric delete index for finding the words within one edit of a string.
+
+    Every word and its single-character deletions are hashed. Two strings within one edit
+    share at least one such variant, so the words sharing a variant hash with the query are
+    the candidates to check. ``hashes`` is sorted, with ``ordinals`` the words each came from.
+    """
+
+    __slots__ = ("hashes", "ordinals")
+
+    def __init__(self, hashes: np.ndarray, ordinals: np.ndarray) -> None:
+        self.hashes = hashes
+        self.ordinals = ordinals
+
+    @classmethod
+    def from_arena(cls, arena: WordArena) -> "FuzzyIndex":
+        crc32 = zlib.crc32
+        hashes = []
+        ordinals = []
+        for ordinal, word in enumerate(arena):
+            variants = {crc32(v) for v in delete_variants(word.encode())}
+            hashes.extend(variants)
+            ordinals.extend([ordinal] * len(variants))
+        hashes = np.array(hashes, dtype=np.uint32)
+        ordinals = np.array(ordinals, dtype=np.uint32)
+        order = np.argsort(hashes, kind="stable")
+        return cls(hashes[order], ordinals[order])
+
+    @property
+    def nbytes(self) -> int:
+        return self.hashes.nbytes + self.ordinals.nbytes
+
+    def candidates(self, word: str) -> np.ndarray:
+        """Ascending ordinals of words that may be within one edit of word. Includes false positives."""
+        query = np.array([zlib.crc32(v) for v in delete_variants(word.encode())], dtype=np.uint32)
+        starts = np.searchsorted(self.hashes, query, side="left")
+        ends = np.searchsorted(self.hashes, query, side="right")
+        if not (ends - starts).any():
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.ordinals[s:e] for s, e in zip(starts, ends)])).astype(np.int64)
@@ -0,0 +1,148 @@
+from string import ascii_lowercase
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from .anagram import AnagramIndex
+from .arena import WordArena
+from .fuzzy import FuzzyIndex
+from .pattern import PositionIndex
+from .suffix import SuffixIndex
+
+# Two-letter prefixes made of letters, in alphabetical order
+BIGRAMS = [a + b for a in ascii_lowercase for b in ascii_lowercase]
+
+# Random picks to try before falling back to the next, more expensive sampling strategy
+SAMPLE_ATTEMPTS = 32
+
+# Bit i of a letter mask is set if the word contains the i-th letter of the alphabet
+_LETTER_BITS = np.zeros(256, dtype=np.uint32)
+for _i, _c in enumerate(ascii_lowercase):
+    _LETTER_BITS[ord(_c)] = 1 << _i
+
+
+def letter_mask(letters: Iterable[str]) -> int:
+    mask = 0
+    for c in letters:
+        if c in ascii_lowercase:
+            mask |= 1 << (ord(c) - ord("a"))
+    return mask
+
+
+def bigram_index(prefix: str) -> int:
+    """Index of prefix in BIGRAMS, or -1 if it is not two letters."""
+    if len(prefix) != 2 or not ("a" <= prefix[0] <= "z" and "a" <= prefix[1] <= "z"):
+        return -1
+    return (ord(prefix[0]) - ord("a")) * 26 + ord(prefix[1]) - ord("a")
+
+
+class WordIndex:
+    """Word arena plus per-word attribute arrays for vectorized candidate filtering.
+
+    ``lengths`` and ``masks`` are indexed by arena ordinal.
+    Words sharing a first letter are contiguous in the arena,
+    ``letter_starts[i]:letter_starts[i + 1]`` being the words starting with the i-th letter,
+    and ``bigram_ranges[i]`` the range of those starting with the i-th of ``BIGRAMS``.
+    ``suffixes`` finds the words ending with a string, ``fuzzy`` those within one edit of it,
+    ``positions`` those matching a wildcard pattern and ``anagrams`` those made of a given set of letters.
+    """
+
+    __slots__ = (
+        "arena", "lengths", "masks", "letter_starts", "bigram_ranges", "suffixes", "fuzzy", "positions", "anagrams"
+    )
+
+    def __init__(
+        self,
+        arena: WordArena,
+        lengths: np.ndarray,
+        masks: np.ndarray,
+        letter_starts: np.ndarray,
+        bigram_ranges: np.ndarray,
+        suffixes: SuffixIndex,
+        fuzzy: FuzzyIndex,
+        positions: PositionIndex,
+        anagrams: AnagramIndex
+    ) -> None:
+        self.arena = arena
+        self.lengths = lengths
+        self.masks = masks
+        self.letter_starts = letter_starts
+        self.bigram_ranges = bigram_ranges
+        self.suffixes = suffixes
+        self.fuzzy = fuzzy
+        self.positions = positions
+        self.anagrams = anagrams
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "WordIndex":
+        return cls.from_arena(WordArena.from_words(words))
+
+    @classmethod
+    def from_arena(cls, arena: WordArena) -> "WordIndex":
+        words = list(arena)
+        encoded = [w.encode() for w in words]
+        lengths = np.fromiter(map(len, words), dtype=np.uint8, count=len(words))
+        if words:
+            # OR together the bits of every byte of each word in one pass
+            byte_lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            starts = np.concatenate(([0], np.cumsum(byte_lengths)[:-1]))
+            chars = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            masks = np.bitwise_or.reduceat(_LETTER_BITS[chars], starts)
+        else:
+            masks = np.zeros(0, dtype=np.uint32)
+        letter_starts = np.array(
+            [arena.lower_bound(chr(c).encode()) for c in range(ord("a"), ord("z") + 2)], dtype=np.int64
+        )
+        bigram_ranges = np.array([arena.prefix_range(b) for b in BIGRAMS], dtype=np.int64).reshape(len(BIGRAMS), 2)
+        return cls(
+            arena,
+            lengths,
+            masks,
+            letter_starts,
+            bigram_ranges,
+            SuffixIndex.from_words(words),
+            FuzzyIndex.from_arena(arena),
+            PositionIndex.from_words(words, lengths),
+            AnagramIndex.from_words(words, lengths)
+        )
+
+    def __len__(self) -> int:
+        return len(self.arena)
+
+    def prefix_range(self, prefix: Optional[str] = None) -> Tuple[int, int]:
+        if not prefix:
+            return 0, len(self.arena)
+        if len(prefix) == 1 and "a" <= prefix <= "z":
+            i = ord(prefix) - ord("a")
+            return int(self.letter_starts[i]), int(self.letter_starts[i + 1])
+        i = bigram_index(prefix)
+        if i >= 0:
+            lo, hi = self.bigram_ranges[i]
+            return int(lo), int(hi)
+        return self.arena.prefix_range(prefix)
+
+    def constraint_mask(
+        self,
+        ordinals: Union[slice, np.ndarray],
+        min_len: int = 1,
+        required_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None
+    ) -> np.ndarray:
+        """Boolean array over the given ordinals, a range or an array, of words satisfying the constraints."""
+        selected = self.lengths[ordinals] >= min_len
+        if required_letter:
+            selected &= (self.masks[ordinals] & letter_mask(required_letter)) != 0
+        if banned_letters:
+            selected &= (self.masks[ordinals] & letter_mask(banned_letters)) == 0
+        return selected
+
+    def candidates(
+        self,
+        min_len: int = 1,
+        prefix: Optional[str] = None,
+        required_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None
+    ) -> np.ndarray:
+        """Sorted ordinals of words satisfying the constraints."""
+        lo, hi = self.prefix_range(prefix)
+        return np.flatnonzero(self.constraint_mask(slice(lo, hi), min_len, required_letter, banned_letters)) + lo
@@ -0,0 +1,99 @@
+import numpy as np
+
+from .counts import LENGTH_BUCKETS
+from .wordlist import WordList
+
+# Last letter of words ending with anything but a letter
+NOT_A_LETTER = 26
+
+
+def _letter(c: str) -> int:
+    i = ord(c) - ord("a") if c else -1
+    return i if 0 <= i < 26 else NOT_A_LETTER
+
+
+class LetterStats:
+    """Numbers of words by first letter, last letter and minimum length, built once per word list.
+
+    ``transitions[a, b, n]`` is the number of words starting with the a-th letter and ending with the b-th
+    with at least n letters, minimum lengths of ``LENGTH_BUCKETS - 1`` or more counting as that,
+    and ``starts`` and ``ends`` its sums over the last and first letters.
+    Only words starting and ending with a letter are counted.
+    ``last_letters[i]`` is the last letter of the word of ordinal i, ``NOT_A_LETTER`` if it is not one.
+
+    The difficulty of a word is how hard it is to follow:
+    the bits of information in its last letter being the first letter of the next word,
+    ``log2(words / words starting with its last letter)``.
+    """
+
+    __slots__ = ("transitions", "starts", "ends", "last_letters", "letter_difficulty")
+
+    def __init__(self, transitions: np.ndarray, last_letters: np.ndarray) -> None:
+        self.transitions = transitions
+        self.starts = transitions.sum(axis=1)
+        self.ends = transitions.sum(axis=0)
+        self.last_letters = last_letters
+        total = int(self.starts[:, 1].sum())
+        # Words ending with no letter cannot be followed, so are as hard as those with the rarest letter
+        difficulty = np.log2((total + 1) / (self.starts[:, 1] + 1))
+        self.letter_difficulty = np.append(difficulty, difficulty.max(initial=0)).astype(np.float32)
+
+    @classmethod
+    def from_words(cls, words: WordList) -> "LetterStats":
+        """Count the words of a word list, leaving out removed ones."""
+        base = words.base
+        n = len(base)
+        first_letters = np.full(words.ordinal_count, NOT_A_LETTER, dtype=np.uint8)
+        last_letters = np.full(words.ordinal_count, NOT_A_LETTER, dtype=np.uint8)
+        # Words sharing a first or last letter take a contiguous range of the arena or the suffix index
+        for i in range(26):
+            first_letters[base.letter_starts[i]:base.letter_starts[i + 1]] = i
+            lo, hi = base.suffixes.letter_starts[i], base.suffixes.letter_starts[i + 1]
+            last_letters[base.suffixes.ordinals[lo:hi]] = i
+        for i, w in enumerate(words.added):
+            first_letters[n + i], last_letters[n + i] = _letter(w[0]), _letter(w[-1])
+        lengths = np.minimum(np.concatenate((base.lengths, words.added_lengths)), LENGTH_BUCKETS - 1)
+
+        counted = (first_letters < NOT_A_LETTER) & (last_letters < NOT_A_LETTER) & ~words.removed
+        keys = (first_letters[counted].astype(np.int64) * 26 + last_letters[counted]) * LENGTH_BUCKETS
+        histogram = np.bincount(keys + lengths[counted], minlength=26 * 26 * LENGTH_BUCKETS)
+        # Words of length n are counted for every minimum length up to n
+        transitions = histogram.reshape(26, 26, LENGTH_BUCKETS)[:, :, ::-1].cumsum(axis=2)[:, :, ::-1]
+        return cls(np.ascontiguousarray(transitions), last_letters)
+
+    @property
+    def nbytes(self) -> int:
+        return self.transitions.nbytes + self.starts.nbytes + self.ends.nbytes + self.last_letters.nbytes
+
+    def starting_with(self, letter: str, min_len: int = 1) -> int:
+        """Number of words starting with letter at least min_len letters long."""
+        i = _letter(letter)
+        return int(self.starts[i, min(min_len, LENGTH_BUCKETS - 1)]) if i < NOT_A_LETTER else 0
+
+    def starting_counts(self, min_len: int = 1) -> np.ndarray:
+        """Number of words at least min_len letters long starting with each letter."""
+        return self.starts[:, min(min_len, LENGTH_BUCKETS - 1)]
+
+    def ending_with(self, letter: str, min_len: int = 1) -> int:
+        """Number of words ending with letter at least min_len letters long."""
+        i = _letter(letter)
+        return int(self.ends[i, min(min_len, LENGTH_BUCKETS - 1)]) if i < NOT_A_LETTER else 0
+
+    def ending_counts(self, min_len: int = 1) -> np.ndarray:
+        """Number of words at least min_len letters long ending with each letter."""
+        return self.ends[:, min(min_len, LENGTH_BUCKETS - 1)]
+
+    def between(self, first: str, last: str, min_len: int = 1) -> int:
+        """Number of words starting with first and ending with last at least min_len letters long."""
+        a, b = _letter(first), _letter(last)
+        if a == NOT_A_LETTER or b == NOT_A_LETTER:
+            return 0
+        return int(self.transitions[a, b, min(min_len, LENGTH_BUCKETS - 1)])
+
+    def difficulty(self, word: str) -> float:
+        """Difficulty of following word, in bits."""
+        return float(self.letter_difficulty[_letter(word[-1:])])
+
+    def difficulty_of(self, ordinals: np.ndarray) -> np.ndarray:
+        """Difficulties of following the words at the given ordinals, in bits."""
+        return self.letter_difficulty[self.last_letters[ordinals]]
@@ -0,0 +1,117 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .index import letter_mask
+from .used import UsedWords
+from .wordlist import COUNT_CHUNK, WordList
+
+_rng = np.random.default_rng()
+
+
+class LongestWords:
+    """Words of a word list grouped by first letter, longest first, for finding the longest valid answer.
+
+    ``ordinals[letter_starts[i]:letter_starts[i + 1]]`` are the ordinals of the words starting with
+    the i-th letter in order of decreasing length, with ``lengths`` and ``masks`` in the same order.
+    Removed words and words not starting with a letter are left out.
+    Letter constraints and used words are checked a chunk at a time from the longest words down,
+    so a long valid answer is usually found in the first chunk.
+    """
+
+    __slots__ = ("ordinals", "lengths", "masks", "letter_starts")
+
+    def __init__(
+        self, ordinals: np.ndarray, lengths: np.ndarray, masks: np.ndarray, letter_starts: np.ndarray
+    ) -> None:
+        self.ordinals = ordinals
+        self.lengths = lengths
+        self.masks = masks
+        self.letter_starts = letter_starts
+
+    @classmethod
+    def from_words(cls, words: WordList) -> "LongestWords":
+        base = words.base
+        n = len(base)
+        first_letters = np.full(words.ordinal_count, 26, dtype=np.int64)
+        # Words sharing a first letter take a contiguous range of the arena
+        for i in range(26):
+            first_letters[base.letter_starts[i]:base.letter_starts[i + 1]] = i
+        for i, w in enumerate(words.added):
+            if "a" <= w[0] <= "z":
+                first_letters[n + i] = ord(w[0]) - ord("a")
+        lengths = np.concatenate((base.lengths, words.added_lengths))
+        masks = np.concatenate((base.masks, words.added_masks))
+
+        kept = np.flatnonzero((first_letters < 26) & ~words.removed)
+        # Sort by first letter, then by decreasing length, keeping alphabetical order within a length
+        ordinals = kept[np.lexsort((-lengths[kept].astype(np.int64), first_letters[kept]))]
+        letter_starts = np.searchsorted(first_letters[ordinals], np.arange(27))
+        return cls(ordinals.astype(np.int32), lengths[ordinals], masks[ordinals], letter_starts)
+
+    @property
+    def nbytes(self) -> int:
+        return self.ordinals.nbytes + self.lengths.nbytes + self.masks.nbytes + self.letter_starts.nbytes
+
+    def _first_valid(
+        self,
+        lo: int,
+        hi: int,
+        required: int,
+        banned: int,
+        exclude: Optional[UsedWords],
+        from_end: bool = False
+    ) -> Optional[int]:
+        # Position of a valid word in [lo, hi), among those of the same length as the first one found
+        # scanning from lo, or from hi backwards if from_end
+        if from_end:
+            starts = range(hi - COUNT_CHUNK, lo - COUNT_CHUNK, -COUNT_CHUNK)
+        else:
+            starts = range(lo, hi, COUNT_CHUNK)
+        for start in starts:
+            start, stop = max(start, lo), min(start + COUNT_CHUNK, hi)
+            selected = np.ones(stop - start, dtype=bool)
+            if required:
+                selected &= (self.masks[start:stop] & required) != 0
+            if banned:
+                selected &= (self.masks[start:stop] & banned) == 0
+            if exclude:
+                selected &= ~exclude.mask_of(self.ordinals[start:stop].astype(np.int64))
+            found = np.flatnonzero(selected) + start
+            if not len(found):
+                continue
+            found = found[self.lengths[found] == self.lengths[found[-1 if from_end else 0]]]
+            return int(found[_rng.integers(len(found))])
+        return None
+
+    def longest(
+        self,
+        letter: str,
+        max_len: int,
+        min_len: int = 1,
+        required_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        exclude: Optional[UsedWords] = None
+    ) -> Optional[int]:
+        """Ordinal of a valid word starting with letter, as long as possible up to max_len letters
+        or else the shortest longer one, None if there are none at least min_len letters long.
+        Chosen at random among the valid words of that length checked first.
+        """
+        i = ord(letter) - ord("a") if len(letter) == 1 else -1
+        if not 0 <= i < 26:
+            return None
+        lo, hi = int(self.letter_starts[i]), int(self.letter_starts[i + 1])
+        # Lengths are decreasing, so words longer than max_len come first and those shorter than min_len last
+        lengths = -self.lengths[lo:hi].astype(np.int64)
+        split = lo + int(np.searchsorted(lengths, -max_len, side="left"))
+        end = lo + int(np.searchsorted(lengths, -min_len, side="right"))
+        required = letter_mask(required_letter) if required_letter else 0
+        banned = letter_mask(banned_letters) if banned_letters else 0
+
+        position = self._first_valid(split, end, required, banned, exclude)
+        if position is None or self.lengths[position] < max_len:
+            # Words longer than max_len are worth as much, so the shortest of them will do
+            longer = self._first_valid(lo, min(split, end), required, banned, exclude, from_end=True)
+            if longer is not None:
+                position = longer
+        return int(self.ordinals[position]) if position is not None else None
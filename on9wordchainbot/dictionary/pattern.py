@@ -0,0 +1,95 @@
+import re
+from typing import Pattern, Sequence
+
+import numpy as np
+
+# Words are at most this long, as lengths are stored in one byte
+MAX_LENGTH = 255
+
+_LETTERS = np.arange(ord("a"), ord("z") + 1, dtype=np.uint32)
+
+
+def compile_pattern(pattern: str) -> Pattern:
+    """Regular expression for pattern, where ? stands for any one character and * for any number of them."""
+    return re.compile("".join("." if c == "?" else ".*" if c == "*" else re.escape(c) for c in pattern), re.DOTALL)
+
+
+class PositionIndex:
+    """Letter-at-position bitmaps of the words of each length, for matching wildcard patterns.
+
+    ``by_length`` holds the ordinals sorted by word length, then ordinal.
+    The words of length n are ``by_length[length_starts[n]:length_starts[n + 1]]``, and among them,
+    bit j of the bitmap for position p and letter c is set if the j-th has that letter at that position.
+    The bitmaps of length n start at ``bitmap_starts[n]`` in ``bitmaps``, ordered by position then letter,
+    and each takes one bit per word of that length, rounded up to whole bytes.
+    """
+
+    __slots__ = ("by_length", "length_starts", "bitmap_starts", "bitmaps")
+
+    def __init__(
+        self, by_length: np.ndarray, length_starts: np.ndarray, bitmap_starts: np.ndarray, bitmaps: np.ndarray
+    ) -> None:
+        self.by_length = by_length
+        self.length_starts = length_starts
+        self.bitmap_starts = bitmap_starts
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def from_words(cls, words: Sequence[str], lengths: np.ndarray) -> "PositionIndex":
+        """Index words, which are in ordinal order, with lengths their lengths in characters."""
+        lengths = np.asarray(lengths, dtype=np.int64)
+        by_length = np.argsort(lengths, kind="stable").astype(np.uint32)
+        counts = np.bincount(lengths, minlength=MAX_LENGTH + 1)
+        length_starts = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        row_bytes = (counts + 7) // 8
+        bitmap_starts = np.concatenate(([0], np.cumsum(row_bytes * np.arange(MAX_LENGTH + 1) * 26))).astype(np.int64)
+
+        bitmaps = np.zeros(int(bitmap_starts[-1]), dtype=np.uint8)
+        for n in np.flatnonzero(counts):
+            group = "".join(words[i] for i in by_length[length_starts[n]:length_starts[n + 1]])
+            # One row of code points per word, compared with every letter at once
+            chars = np.frombuffer(group.encode("utf-32-le"), dtype="<u4").reshape(-1, n)
+            bits = chars.T[:, None, :] == _LETTERS[None, :, None]
+            bitmaps[bitmap_starts[n]:bitmap_starts[n + 1]] = np.packbits(bits, axis=2, bitorder="little").ravel()
+        return cls(by_length, length_starts, bitmap_starts, bitmaps)
+
+    @property
+    def nbytes(self) -> int:
+        return self.by_length.nbytes + self.length_starts.nbytes + self.bitmap_starts.nbytes + self.bitmaps.nbytes
+
+    def candidates(self, pattern: str, lo: int, hi: int) -> np.ndarray:
+        """Ascending ordinals in [lo, hi) of words as long as pattern allows with its letters before
+        the first * and after the last * in place. Exact if pattern has at most one *.
+        """
+        head, star, rest = pattern.partition("*")
+        tail = rest.rpartition("*")[2]
+        min_len = len(pattern) - pattern.count("*")
+        max_len = len(self.length_starts) - 2 if star else min_len
+
+        matches = []
+        for n in range(min_len, max_len + 1):
+            start, end = int(self.length_starts[n]), int(self.length_starts[n + 1])
+            group = self.by_length[start:end]
+            a, b = int(np.searchsorted(group, lo)), int(np.searchsorted(group, hi))
+            if a >= b:
+                continue
+            row_bytes = (end - start + 7) // 8
+            lo_byte, hi_byte = a >> 3, (b + 7) >> 3
+            selected = None
+            fixed = [(p, c) for p, c in enumerate(head) if c != "?"]
+            fixed += [(n - len(tail) + p, c) for p, c in enumerate(tail) if c != "?"]
+            for p, c in fixed:
+                if not "a" <= c <= "z":  # Not indexed, and no word has it
+                    selected = np.zeros(hi_byte - lo_byte, dtype=np.uint8)
+                    break
+                row = int(self.bitmap_starts[n]) + (p * 26 + ord(c) - ord("a")) * row_bytes
+                bitmap = self.bitmaps[row + lo_byte:row + hi_byte]
+                selected = bitmap.copy() if selected is None else np.bitwise_and(selected, bitmap, out=selected)
+            if selected is None:
+                matches.append(group[a:b])
+            else:
+                bits = np.unpackbits(selected, bitorder="little")[a - (lo_byte << 3):b - (lo_byte << 3)]
+                matches.append(group[a:b][bits.astype(bool)])
+        if not matches:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate(matches)).astype(np.int64)
@@ -0,0 +1,57 @@
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from .counts import LENGTH_BUCKETS
+
+_rng = np.random.default_rng()
+
+
+class VPTier(NamedTuple):
+    """How a virtual player weighs the valid answers of a turn.
+
+    Each answer scores ``trap_weight`` per bit of difficulty of following it,
+    ``log2(answers for any letter / answers for its last letter)`` counted in the next player's answers,
+    plus ``length_weight`` per letter beyond the minimum length, up to ``LENGTH_BUCKETS - 1`` letters.
+    Answers are chosen with probabilities proportional to ``exp(score / temperature)``.
+    """
+
+    trap_weight: float
+    length_weight: float
+    temperature: float
+
+    def choose(self, lengths: np.ndarray, last_letters: np.ndarray, followers: np.ndarray, min_len: int) -> int:
+        """Index of the answer chosen among answers of the given lengths and last letters,
+        followers[i] being the next player's answers if the i-th letter of the alphabet ends the answer.
+        No answer follows a last letter of 26, which stands for anything but a letter.
+        Other keys the next answer depends on can take the place of last letters, such as the indexes
+        in BIGRAMS of the last two letters, with ``len(followers)`` standing for anything else.
+        """
+        bits = np.log2((float(followers.sum()) + 1) / (np.append(followers, 0) + 1))
+        letter_scores = self.trap_weight * bits
+        length_scores = self.length_weight * (np.arange(LENGTH_BUCKETS) - min_len)
+        # Relative to the highest scores, so that no weight overflows
+        weights = np.exp(
+            (letter_scores[:, None] - letter_scores.max() + length_scores[None, :] - length_scores.max())
+            / self.temperature
+        ).ravel()
+
+        # Scores only depend on the last letter and the length, so pick one of those first
+        # and then one of the answers with them
+        buckets = last_letters.astype(np.intp) * LENGTH_BUCKETS + np.minimum(lengths, LENGTH_BUCKETS - 1)
+        cumulative = np.cumsum(np.bincount(buckets, minlength=len(weights)) * weights)
+        bucket = int(np.searchsorted(cumulative, _rng.random() * cumulative[-1], side="right"))
+        if bucket >= len(weights):  # Every weight rounded to 0
+            return int(_rng.integers(len(buckets)))
+        answers = np.flatnonzero(buckets == bucket)
+        return int(answers[_rng.integers(len(answers))])
+
+
+# Easy plays short words that are easy to follow, normal any valid word
+# and hard mostly words leaving the next player few answers or none
+VP_TIERS: Dict[str, VPTier] = {
+    "easy": VPTier(trap_weight=-1.0, length_weight=-0.5, temperature=1.0),
+    "normal": VPTier(trap_weight=0.0, length_weight=0.0, temperature=1.0),
+    "hard": VPTier(trap_weight=2.0, length_weight=0.1, temperature=0.5)
+}
+DEFAULT_VP_TIER = "normal"
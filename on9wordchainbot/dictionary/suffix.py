@@ -0,0 +1,49 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .arena import WordArena
+
+
+class SuffixIndex:
+    """The words in order of their reversed spelling, for queries on how words end.
+
+    ``arena`` holds the reversed words, so the words ending with a suffix take a contiguous range of it,
+    the prefix range of the reversed suffix. ``ordinals[i]`` is the ordinal of the word reversed at position i.
+    ``letter_starts[i]:letter_starts[i + 1]`` is the range of the words ending with the i-th letter.
+    """
+
+    __slots__ = ("arena", "ordinals", "letter_starts")
+
+    def __init__(self, arena: WordArena, ordinals: np.ndarray, letter_starts: np.ndarray) -> None:
+        self.arena = arena
+        self.ordinals = ordinals
+        self.letter_starts = letter_starts
+
+    @classmethod
+    def from_words(cls, words: Sequence[str]) -> "SuffixIndex":
+        """Index words, which are in ordinal order."""
+        reversed_words = [w[::-1].encode() for w in words]
+        # Sorted the same way as in the arena
+        order = sorted(range(len(words)), key=reversed_words.__getitem__)
+        arena = WordArena.from_words(w[::-1] for w in words)
+        letter_starts = np.array(
+            [arena.lower_bound(chr(c).encode()) for c in range(ord("a"), ord("z") + 2)], dtype=np.int64
+        )
+        return cls(arena, np.array(order, dtype=np.uint32), letter_starts)
+
+    @property
+    def nbytes(self) -> int:
+        return self.arena.nbytes + self.ordinals.nbytes + self.letter_starts.nbytes
+
+    def suffix_range(self, suffix: str) -> Tuple[int, int]:
+        """Range of positions of the words ending with suffix."""
+        if len(suffix) == 1 and "a" <= suffix <= "z":
+            i = ord(suffix) - ord("a")
+            return int(self.letter_starts[i]), int(self.letter_starts[i + 1])
+        return self.arena.prefix_range(suffix[::-1])
+
+    def ending_with(self, suffix: str) -> np.ndarray:
+        """Ordinals of the words ending with suffix, in order of their reversed spelling."""
+        lo, hi = self.suffix_range(suffix)
+        return self.ordinals[lo:hi].astype(np.int64)
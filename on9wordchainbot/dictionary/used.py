@@ -0,0 +1,112 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Set
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .wordlist import WordList
+
+
+class UsedWords:
+    """Set of words used in a game, kept as a bitset over the ordinals of a word list.
+
+    Takes one bit per word in the word list however long the game runs, and lets candidate filtering
+    exclude used words with a vectorized AND-NOT rather than hashing each candidate.
+    Words the word list does not have are kept in a plain set.
+    ``rebind`` moves the set to another word list, remapping ordinals if they differ.
+
+    Blocked words are excluded the same way, but are neither counted nor reported as used.
+    """
+
+    __slots__ = ("words", "bits", "others", "count", "blocked")
+
+    def __init__(self, words: "WordList") -> None:
+        self.words = words
+        self.bits = np.zeros((words.ordinal_count + 7) // 8, dtype=np.uint8)
+        self.others: Set[str] = set()
+        self.count = 0
+        self.blocked: Set[str] = set()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str) or word in self.blocked:
+            return False
+        ordinal = self.words.find(word, include_removed=True)
+        return self.has(ordinal) if ordinal is not None else word in self.others
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.words.iter_ordinals(self.ordinals())
+        yield from self.others
+
+    def has(self, ordinal: int) -> bool:
+        return bool(self.bits[ordinal >> 3] & (1 << (ordinal & 7)))
+
+    def add(self, word: Optional[str]) -> None:
+        if word in self.blocked:
+            return
+        ordinal = self.words.find(word, include_removed=True) if word else None
+        if ordinal is None:
+            if word not in self.others:
+                self.others.add(word)
+                self.count += 1
+        elif not self.has(ordinal):
+            self.bits[ordinal >> 3] |= 1 << (ordinal & 7)
+            self.count += 1
+
+    def block(self, words: Iterable[str]) -> None:
+        """Exclude words from candidates like used words, such as those a group blocks."""
+        for word in words:
+            self.blocked.add(word)
+            ordinal = self.words.find(word, include_removed=True)
+            if ordinal is not None:
+                self.bits[ordinal >> 3] |= 1 << (ordinal & 7)
+
+    def ordinals(self) -> np.ndarray:
+        """Ascending ordinals of the used words in the word list."""
+        ordinals = np.flatnonzero(np.unpackbits(self.bits, bitorder="little"))
+        if not self.blocked:
+            return ordinals
+        blocked = [self.words.find(word, include_removed=True) for word in self.blocked]
+        return np.setdiff1d(ordinals, [o for o in blocked if o is not None])
+
+    def mask(self, lo: int, hi: int) -> np.ndarray:
+        """Boolean array over ordinals [lo, hi), set for used words."""
+        bits = np.unpackbits(self.bits[lo >> 3:(hi + 7) >> 3], bitorder="little")
+        start = lo & 7
+        return bits[start:start + hi - lo].astype(bool)
+
+    def mask_of(self, ordinals: np.ndarray) -> np.ndarray:
+        """Boolean array over the given ordinals, set for used words."""
+        return (self.bits[ordinals >> 3] >> (ordinals & 7) & 1).astype(bool)
+
+    def copy(self) -> "UsedWords":
+        """Independent copy, such as for a search in another thread while the game goes on."""
+        used = UsedWords(self.words)
+        used.bits = self.bits.copy()
+        used.others = set(self.others)
+        used.count = self.count
+        used.blocked = set(self.blocked)
+        return used
+
+    def rebind(self, words: "WordList") -> None:
+        """Move to another word list, such as a newer snapshot's."""
+        if words is self.words:
+            return
+        if words.base is self.words.base:
+            # Same base, so ordinals are unchanged and there may only be more added words
+            size = (words.ordinal_count + 7) // 8
+            if size > len(self.bits):
+                self.bits = np.concatenate((self.bits, np.zeros(size - len(self.bits), dtype=np.uint8)))
+            # Words outside the previous word list may be in this one
+            readd = list(self.others)
+            self.count -= len(readd)
+        else:
+            readd = list(self)
+            self.bits = np.zeros((words.ordinal_count + 7) // 8, dtype=np.uint8)
+            self.count = 0
+        self.words = words
+        self.others.clear()
+        for word in readd:
+            self.add(word)
+        self.block(list(self.blocked))
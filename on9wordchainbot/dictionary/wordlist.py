@@ -0,0 +1,433 @@
+import heapq
+import random
+from itertools import compress, islice
+from string import ascii_lowercase
+from typing import Container, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .anagram import letter_counts, signature
+from .fuzzy import within_one_edit
+from .index import SAMPLE_ATTEMPTS, WordIndex, bigram_index, letter_mask
+from .pattern import compile_pattern
+from .used import UsedWords
+
+# Words checked at a time when counting, so that counting up to a limit can stop early
+COUNT_CHUNK = 4096
+
+
+class WordList:
+    """A base word index with small overlays of added and removed words.
+
+    Ordinals below ``len(base)`` are the base's. Added words take the following ordinals in order of addition.
+    ``removed`` flags removed words over the whole ordinal space.
+    Ordinals never change for the lifetime of a base, so a diff can be applied without invalidating them.
+
+    Instances are never modified: ``with_changes`` returns a new one sharing the base.
+    """
+
+    __slots__ = ("base", "added", "added_lengths", "added_masks", "added_ordinals", "removed", "count")
+
+    def __init__(
+        self,
+        base: WordIndex,
+        added: Sequence[str] = (),
+        removed: Optional[np.ndarray] = None
+    ) -> None:
+        self.base = base
+        self.added = tuple(added)
+        self.added_lengths = np.fromiter(map(len, self.added), dtype=np.uint8, count=len(self.added))
+        self.added_masks = np.fromiter(map(letter_mask, self.added), dtype=np.uint32, count=len(self.added))
+        self.added_ordinals: Dict[str, int] = {w: len(base) + i for i, w in enumerate(self.added)}
+        if removed is None:
+            removed = np.zeros(len(base) + len(self.added), dtype=bool)
+        self.removed = removed
+        self.count = len(removed) - int(np.count_nonzero(removed))
+
+    def with_changes(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> "WordList":
+        """New word list with words added and removed, leaving this one untouched."""
+        new_words = list(self.added)
+        appended: Dict[str, int] = {}
+        revived = []
+        for word in added:
+            ordinal = self.find(word, include_removed=True)
+            if ordinal is not None:
+                revived.append(ordinal)
+            elif 0 < len(word) < 256 and word not in appended:  # Same limit as the arena
+                appended[word] = len(self.base) + len(new_words)
+                new_words.append(word)
+
+        tombstones = np.concatenate((self.removed, np.zeros(len(appended), dtype=bool)))
+        tombstones[revived] = False
+        for word in removed:
+            ordinal = self.find(word, include_removed=True)
+            if ordinal is None:
+                ordinal = appended.get(word)
+            if ordinal is not None:
+                tombstones[ordinal] = True
+        return WordList(self.base, new_words, tombstones)
+
+    @property
+    def ordinal_count(self) -> int:
+        """Number of ordinals in use, including those of removed words."""
+        return len(self.removed)
+
+    @property
+    def overlay_size(self) -> int:
+        """Number of words the overlays differ from the base by."""
+        return len(self.added) + int(np.count_nonzero(self.removed[:len(self.base)]))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.find(word) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_ordinals(np.flatnonzero(~self.removed))
+
+    def __getitem__(self, ordinal: int) -> str:
+        n = len(self.base)
+        return self.base.arena[ordinal] if ordinal < n else self.added[ordinal - n]
+
+    def find(self, word: str, include_removed: bool = False) -> Optional[int]:
+        """Ordinal of word, or None if absent."""
+        ordinal = self.base.arena.find(word)
+        if ordinal is None:
+            ordinal = self.added_ordinals.get(word)
+        if ordinal is None or self.removed[ordinal] and not include_removed:
+            return None
+        return ordinal
+
+    def _check_bound(self, used: Optional[UsedWords]) -> None:
+        if used is not None and used.words is not self:
+            raise ValueError("Used words are bound to another word list")
+
+    def iter_ordinals(self, ordinals: Iterable[int]) -> Iterator[str]:
+        """Lazily yield the words at the given ordinals, which must be in ascending order."""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        split = int(np.searchsorted(ordinals, len(self.base)))
+        yield from self.base.arena.iter_ordinals(ordinals[:split])
+        for ordinal in ordinals[split:]:
+            yield self.added[ordinal - len(self.base)]
+
+    def lengths_of(self, ordinals: np.ndarray) -> np.ndarray:
+        """Lengths of the words at the given ordinals, which must be in ascending order."""
+        split = int(np.searchsorted(ordinals, len(self.base)))
+        return np.concatenate((
+            self.base.lengths[ordinals[:split]], self.added_lengths[ordinals[split:] - len(self.base)]
+        ))
+
+    def bigrams_of(self, ordinals: np.ndarray) -> np.ndarray:
+        """Indexes in BIGRAMS of the first two letters of the words at the given ordinals,
+        which must be in ascending order, or -1 for words not starting with two letters.
+        """
+        split = int(np.searchsorted(ordinals, len(self.base)))
+        base_ordinals = ordinals[:split]
+        ranges = self.base.bigram_ranges
+        # The ranges are disjoint and in order, so the only one a word can be in is the last starting before it
+        buckets = np.searchsorted(ranges[:, 0], base_ordinals, side="right") - 1
+        inside = (buckets >= 0) & (base_ordinals < ranges[np.maximum(buckets, 0), 1])
+        added = [bigram_index(self.added[o - len(self.base)][:2]) for o in ordinals[split:]]
+        return np.concatenate((np.where(inside, buckets, -1), np.array(added, dtype=np.int64)))
+
+    def first_letters_of(self, ordinals: np.ndarray) -> np.ndarray:
+        """Indexes in the alphabet of the first letters of the words at the given ordinals,
+        which must be in ascending order, or 26 for words not starting with a letter.
+        """
+        split = int(np.searchsorted(ordinals, len(self.base)))
+        # Words starting with each letter take a contiguous range of the arena
+        letters = np.searchsorted(self.base.letter_starts, ordinals[:split], side="right") - 1
+        letters[(letters < 0) | (letters >= 26)] = 26
+        added = [ord(w[0]) - ord("a") if "a" <= w[0] <= "z" else 26 for w in self.iter_ordinals(ordinals[split:])]
+        return np.concatenate((letters, np.array(added, dtype=np.int64)))
+
+    def _added_affix_mask(self, prefix: Optional[str], suffix: Optional[str] = None) -> np.ndarray:
+        if not prefix and not suffix:
+            return np.ones(len(self.added), dtype=bool)
+        return np.fromiter(
+            (w.startswith(prefix or "") and w.endswith(suffix or "") for w in self.added),
+            dtype=bool,
+            count=len(self.added)
+        )
+
+    def starts_with(self, prefix: str) -> Iterator[str]:
+        """Lazily yield words that start with prefix in alphabetical order."""
+        lo, hi = self.base.prefix_range(prefix)
+        # Words are decoded only as they are consumed
+        base_words = compress(self.base.arena.iter_range(lo, hi), ~self.removed[lo:hi])
+        n = len(self.base)
+        added = sorted(
+            w for i, w in enumerate(self.added) if w.startswith(prefix) and not self.removed[n + i]
+        )
+        return heapq.merge(base_words, added) if added else base_words
+
+    def top_k(self, prefix: str, k: int) -> List[str]:
+        """The first k words in alphabetical order that start with prefix, without visiting the rest."""
+        return list(islice(self.starts_with(prefix), k))
+
+    def match_pattern(self, pattern: str, limit: int) -> List[str]:
+        """The first limit words in alphabetical order matching pattern,
+        where ? stands for any one character and * for any number of them.
+        """
+        prefix = pattern[:len(pattern) - len(pattern.lstrip(ascii_lowercase))]
+        lo, hi = self.base.prefix_range(prefix)
+        ordinals = self.base.positions.candidates(pattern, lo, hi)
+        ordinals = ordinals[~self.removed[ordinals]]
+        regex = compile_pattern(pattern)
+        if pattern.count("*") > 1:
+            # Letters between stars are not at fixed positions, so check the words having all the letters
+            required = letter_mask(pattern)
+            ordinals = ordinals[self.base.masks[ordinals] & required == required]
+            base_words = filter(regex.fullmatch, self.base.arena.iter_ordinals(ordinals))
+        else:
+            base_words = self.base.arena.iter_ordinals(ordinals)
+        n = len(self.base)
+        added = sorted(
+            w for i, w in enumerate(self.added) if not self.removed[n + i] and regex.fullmatch(w)
+        )
+        return list(islice(heapq.merge(base_words, added) if added else base_words, limit))
+
+    def anagrams(self, letters: str) -> List[str]:
+        """Words made of exactly the given letters, in alphabetical order."""
+        key = signature(letters)
+        ordinals = self.base.anagrams.candidates(letters)
+        ordinals = ordinals[~self.removed[ordinals]]
+        words = [w for w in self.iter_ordinals(ordinals) if signature(w) == key]
+        n = len(self.base)
+        words += [w for i, w in enumerate(self.added) if not self.removed[n + i] and signature(w) == key]
+        return sorted(words)
+
+    def formable(self, letters: str, min_len: int = 1) -> List[str]:
+        """Words that can be spelt with the given letters, each used at most as many times as given,
+        longest first, then in alphabetical order.
+        """
+        available = letter_counts(letters)
+        unavailable = letter_mask(c for c in ascii_lowercase if c not in letters)
+        n = len(self.base)
+        lengths = self.base.lengths
+        # Narrow down by length and letters present before comparing letter counts
+        selected = (lengths >= min_len) & (lengths <= len(letters)) & (self.base.masks & unavailable == 0)
+        selected &= ~self.removed[:n]
+        ordinals = np.flatnonzero(selected)
+        counts = self.base.anagrams.letter_counts[ordinals]
+        # Words with characters other than letters have fewer letters than characters
+        ordinals = ordinals[(counts <= available).all(axis=1) & (counts.sum(axis=1) == lengths[ordinals])]
+        words = list(self.iter_ordinals(ordinals))
+
+        for i, w in enumerate(self.added):
+            if (
+                min_len <= len(w) <= len(letters) and not self.removed[n + i]
+                and all(c in ascii_lowercase for c in w) and (letter_counts(w) <= available).all()
+            ):
+                words.append(w)
+        words.sort(key=lambda w: (-len(w), w))
+        return words
+
+    def candidates(
+        self,
+        min_len: int = 1,
+        prefix: Optional[str] = None,
+        required_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        exclude: Optional[UsedWords] = None,
+        suffix: Optional[str] = None
+    ) -> np.ndarray:
+        """Ascending ordinals of words satisfying the constraints and not in exclude."""
+        self._check_bound(exclude)
+        lo, hi = self.base.prefix_range(prefix)
+        if suffix:
+            # Words ending with suffix, narrowed down to those in the prefix range
+            ordinals = self.base.suffixes.ending_with(suffix)
+            ordinals = np.sort(ordinals[(ordinals >= lo) & (ordinals < hi)])
+            selected = self.base.constraint_mask(ordinals, min_len, required_letter, banned_letters)
+            selected &= ~self.removed[ordinals]
+            if exclude:
+                selected &= ~exclude.mask_of(ordinals)
+            ordinals = ordinals[selected]
+        else:
+            selected = self.base.constraint_mask(slice(lo, hi), min_len, required_letter, banned_letters)
+            selected &= ~self.removed[lo:hi]
+            if exclude:
+                selected &= ~exclude.mask(lo, hi)
+            ordinals = np.flatnonzero(selected) + lo
+        if not self.added:
+            return ordinals
+        added = self._added_selected(min_len, prefix, required_letter, banned_letters, exclude, suffix)
+        return np.concatenate((ordinals, np.flatnonzero(added) + len(self.base)))
+
+    def _added_selected(
+        self,
+        min_len: int,
+        prefix: Optional[str],
+        required_letter: Optional[str],
+        banned_letters: Optional[Iterable[str]],
+        exclude: Optional[UsedWords],
+        suffix: Optional[str]
+    ) -> np.ndarray:
+        # Boolean array over the added words, set for those satisfying the constraints and not in exclude
+        added = (self.added_lengths >= min_len) & self._added_affix_mask(prefix, suffix)
+        if required_letter:
+            added &= (self.added_masks & letter_mask(required_letter)) != 0
+        if banned_letters:
+            added &= (self.added_masks & letter_mask(banned_letters)) == 0
+        added &= ~self.removed[len(self.base):]
+        if exclude:
+            added &= ~exclude.mask(len(self.base), self.ordinal_count)
+        return added
+
+    def count_candidates(
+        self,
+        min_len: int = 1,
+        prefix: Optional[str] = None,
+        required_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        exclude: Optional[UsedWords] = None,
+        suffix: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> int:
+        """Number of words satisfying the constraints and not in exclude, stopping at limit if given.
+
+        The prefix range is checked a chunk at a time, so counting up to a small limit
+        only looks at the first chunk when valid words are common.
+        """
+        if suffix:
+            # Words ending with a suffix are few enough to list
+            n = len(self.candidates(min_len, prefix, required_letter, banned_letters, exclude, suffix))
+            return n if limit is None else min(n, limit)
+        self._check_bound(exclude)
+        lo, hi = self.base.prefix_range(prefix)
+        n = 0
+        for start in range(lo, hi, COUNT_CHUNK):
+            stop = min(start + COUNT_CHUNK, hi)
+            selected = self.base.constraint_mask(slice(start, stop), min_len, required_letter, banned_letters)
+            selected &= ~self.removed[start:stop]
+            if exclude:
+                selected &= ~exclude.mask(start, stop)
+            n += int(np.count_nonzero(selected))
+            if limit is not None and n >= limit:
+                return limit
+        if self.added:
+            n += int(np.count_nonzero(
+                self._added_selected(min_len, prefix, required_letter, banned_letters, exclude, None)
+            ))
+        return n if limit is None else min(n, limit)
+
+    def suggest(
+        self,
+        word: str,
+        limit: int = 3,
+        min_len: int = 1,
+        prefix: Optional[str] = None,
+        required_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        exclude_words: Union[Container[str], UsedWords, None] = None,
+        suffix: Optional[str] = None
+    ) -> List[str]:
+        """Up to limit words within one edit of word that satisfy the constraints, closest in length first."""
+        used = exclude_words if isinstance(exclude_words, UsedWords) else None
+        self._check_bound(used)
+        required = letter_mask(required_letter or "")
+        banned = letter_mask(banned_letters or ())
+
+        ordinals = self.base.fuzzy.candidates(word)
+        ordinals = ordinals[
+            (self.base.lengths[ordinals] >= min_len)
+            & (self.base.masks[ordinals] & required == required)
+            & (self.base.masks[ordinals] & banned == 0)
+            & ~self.removed[ordinals]
+        ]
+        if used:
+            ordinals = ordinals[~np.fromiter(map(used.has, ordinals), dtype=bool, count=len(ordinals))]
+        words = [w for w in self.iter_ordinals(ordinals) if w != word and within_one_edit(w, word)]
+
+        # Added words are few enough to check directly
+        for i, w in enumerate(self.added):
+            n = len(self.base) + i
+            mask = int(self.added_masks[i])
+            if (
+                w != word and len(w) >= min_len and mask & required == required and not mask & banned
+                and not self.removed[n] and not (used and used.has(n)) and within_one_edit(w, word)
+            ):
+                words.append(w)
+
+        words = [
+            w for w in words
+            if (not prefix or w.startswith(prefix)) and (not suffix or w.endswith(suffix))
+            and (used or not exclude_words or w not in exclude_words)
+        ]
+        words.sort(key=lambda w: (abs(len(w) - len(word)), w))
+        return words[:limit]
+
+    def sample(
+        self,
+        min_len: int = 1,
+        prefix: Optional[str] = None,
+        required_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        exclude_words: Union[Container[str], UsedWords, None] = None,
+        suffix: Optional[str] = None
+    ) -> Optional[str]:
+        """Uniformly random word satisfying the constraints and not in exclude_words, or None.
+
+        Never builds the list of candidates. Each stage below is uniform over the valid words,
+        so falling through to the next stage does not bias the result.
+        Used words of a game bound to this word list are excluded by ordinal.
+        """
+        used = exclude_words if isinstance(exclude_words, UsedWords) else None
+        self._check_bound(used)
+        if used is not None:
+            exclude_words = None
+        lo, hi = self.base.prefix_range(prefix)
+        # Positions [start, stop) to sample from, in the suffix index if there is a suffix
+        if suffix:
+            start, stop = self.base.suffixes.suffix_range(suffix)
+            by_suffix = self.base.suffixes.ordinals
+        else:
+            start, stop = lo, hi
+            by_suffix = None
+        n_added = len(self.added)
+        if start >= stop and not n_added:
+            return None
+        required = letter_mask(required_letter or "")
+        banned = letter_mask(banned_letters or ())
+        lengths, masks, removed = self.base.lengths, self.base.masks, self.removed
+
+        # Rejection sampling over the prefix or suffix range and the added words,
+        # which succeeds quickly when valid words are common
+        for _ in range(SAMPLE_ATTEMPTS):
+            i = random.randrange(stop - start + n_added)
+            if i < stop - start:
+                i += start
+                if by_suffix is not None:
+                    i = int(by_suffix[i])
+                    if not lo <= i < hi:
+                        continue
+                length, mask = lengths[i], int(masks[i])
+            else:
+                i -= stop - start
+                word = self.added[i]
+                if prefix and not word.startswith(prefix) or suffix and not word.endswith(suffix):
+                    continue
+                length, mask = self.added_lengths[i], int(self.added_masks[i])
+                i += len(self.base)
+            if (
+                length >= min_len and mask & required == required and not mask & banned and not removed[i]
+                and not (used and used.has(i))
+            ):
+                word = self[i]
+                if not exclude_words or word not in exclude_words:
+                    return word
+
+        # Valid words are sparse, select a random rank among the words satisfying the constraints
+        ordinals = self.candidates(min_len, prefix, required_letter, banned_letters, used, suffix)
+        if not len(ordinals):
+            return None
+        for _ in range(SAMPLE_ATTEMPTS):
+            word = self[int(ordinals[random.randrange(len(ordinals))])]
+            if not exclude_words or word not in exclude_words:
+                return word
+
+        # Nearly every candidate has been excluded, so there are few left to choose from
+        words = [w for w in self.iter_ordinals(ordinals) if w not in exclude_words]
+        return random.choice(words) if words else None
@@ -4,6 +4,7 @@ import asyncio
 
 from .. import GlobalState
 from ..bot_instance import dp, bot
+from ..words import Words
 from ..models.game import (
     ClassicGame,
     BannedLettersGame,
@@ -18,6 +19,10 @@ from ..models.game import (
 
 async def start_game(message: types.Message, game_class):
     """Helper function to start a game"""
+    if not Words.ready.is_set():
+        await message.reply("I'm still loading my dictionary. Please try again in a few seconds.")
+        return
+
     async with GlobalState.games_lock:
         if message.chat.id in GlobalState.games:
             await message.reply("A game is already running in this chat!")
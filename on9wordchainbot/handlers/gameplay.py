@@ -10,6 +10,7 @@ from .. import GlobalState, dp, on9bot
 from ..constants import GameSettings, GameState, VIP, VIP_GROUP
 from ..models import ClassicGame, EliminationGame, GAME_MODES, MixedEliminationGame
 from ..utils import amt_donated, send_groups_only_message
+from ..words import Words
 
 
 
@@ -28,6 +29,13 @@ async def start_game(message: types.Message, game_type: Type[ClassicGame]) -> No
         await GlobalState.games[group_id].join(message)
         return
 
+    if not Words.ready.is_set():
+        await message.reply(
+            "I'm still loading my dictionary. Please try again in a few seconds.",
+            allow_sending_without_reply=True
+        )
+        return
+
     if GlobalState.maint_mode:
         # Only stop people from starting games, not joining
         await message.reply(
@@ -185,17 +193,7 @@ async def cmd_forceskip(message: types.Message) -> None:
 
 @dp.message_handler(game_running=True, commands="addvp")
 async def cmd_addvp(message: types.Message) -> None:
-    group_id = message.chat.id
-    if isinstance(GlobalState.games[group_id], EliminationGame):
-        await message.reply(
-            (
-                f"Sorry, [{(await on9bot.me).full_name}](https://t.me/{(await on9bot.me).username}) "
-                "can't play elimination games."
-            ),
-            allow_sending_without_reply=True
-        )
-        return
-    await GlobalState.games[group_id].addvp(message)
+    await GlobalState.games[message.chat.id].addvp(message)
 
 
 @dp.message_handler(game_running=True, commands="remvp")
@@ -9,7 +9,9 @@ from aiogram.utils.markdown import quote_html
 
 from .. import GlobalState, bot, dp
 from ..constants import GameState
-from ..utils import inline_keyboard_from_button, send_private_only_message
+from ..models import ClassicGame
+from ..scheduler import scheduler
+from ..utils import inline_keyboard_from_button, inline_results_cache, send_private_only_message
 from ..words import Words
 
 
@@ -56,7 +58,9 @@ async def cmd_gameinfo(message: types.Message) -> None:
             "/startcfl - Chosen first letter game\n"
             "/startrfl - Random first letter game\n"
             "/startbl - Banned letters game\n"
-            "/startrl - Required letter game\n\n"
+            "/startrl - Required letter game\n"
+            "/startrev - Reverse chain game (words end with the first letter of the previous word)\n"
+            "/starttl - Two letter chain game (words start with the last two letters of the previous word)\n\n"
             "/startelim - Elimination game\n"
             "Each player's score is their cumulative word length. "
             "The lowest scoring players are eliminated after each round.\n\n"
@@ -112,11 +116,24 @@ async def cmd_runinfo(message: types.Message) -> None:
         + " HKT"
     )
     uptime = datetime.now().replace(microsecond=0) - GlobalState.build_time
+    vp_seconds = list(ClassicGame.vp_answer_seconds)
+    vp_answer_str = (
+        f"`{len(vp_seconds)}` answers, `{sum(vp_seconds) / len(vp_seconds) * 1000:.1f}`ms mean, "
+        f"`{max(vp_seconds) * 1000:.1f}`ms max"
+    ) if vp_seconds else "`0` answers"
+    timers = scheduler.stats()
     await message.reply(
         (
             f"Build time: `{build_time_str}`\n"
             f"Uptime: `{uptime.days}.{str(uptime).rsplit(maxsplit=1)[-1]}`\n"
-            f"Words in dictionary: `{Words.count}`\n"
+            f"Words in dictionary: `{Words.snapshot.count}`\n"
+            f"Dictionary version: `{Words.snapshot.version}` "
+            f"(`{len(Words.live_versions())}` in use)\n"
+            f"Inline cache: `{inline_results_cache.hits}` hits, `{inline_results_cache.misses}` misses "
+            f"(`{inline_results_cache.hit_rate:.1%}`)\n"
+            f"VP answer time: {vp_answer_str}\n"
+            f"Timers: `{timers['pending']}` pending, `{timers['lag_mean_ms']:.1f}`ms mean lag, "
+            f"`{timers['lag_max_ms']:.1f}`ms max lag\n"
             f"Total games: `{len(GlobalState.games)}`\n"
             f"Running games: `{len([g for g in GlobalState.games.values() if g.state == GameState.RUNNING])}`\n"
             f"Players: `{sum(len(g.players) for g in GlobalState.games.values())}`"
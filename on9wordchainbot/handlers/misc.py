@@ -1,5 +1,6 @@
 import asyncio
 import traceback
+from typing import List
 from uuid import uuid4
 
 from aiogram import types
@@ -11,7 +12,7 @@ from .donation import send_donate_invoice
 from .. import GlobalState, bot, dp, db
 from ..constants import ADMIN_GROUP_ID, GameState, OFFICIAL_GROUP_ID, VIP
 from ..models import GAME_MODES
-from ..utils import ADD_TO_GROUP_KEYBOARD, amt_donated, is_word, send_admin_group
+from ..utils import ADD_TO_GROUP_KEYBOARD, amt_donated, inline_results_cache, is_word, send_admin_group
 from ..words import Words
 
 
@@ -105,6 +106,9 @@ async def new_member(message: types.Message) -> None:
         )
 
 
+INLINE_RESULTS_LIMIT = 50  # Max results Telegram accepts per inline query
+
+
 @dp.inline_handler()
 async def inline_handler(inline_query: types.InlineQuery):
     text = inline_query.query.lower()
@@ -137,39 +141,46 @@ async def inline_handler(inline_query: types.InlineQuery):
         )
         return
 
+    await inline_query.answer(render_word_results(text), is_personal=True)
+
+
+def render_word_results(prefix: str) -> List[types.InlineQueryResultArticle]:
+    # Results are the same for everyone until the word list changes, so popular prefixes are served from memory
+    snapshot = Words.snapshot
+    key = (snapshot.version, prefix)
+    res = inline_results_cache.get(key)
+    if res is not None:
+        return res
+
     res = []
-    # Get words that start with the query text
-    matching_words = Words.starts_with(text.lower())
-    for word in matching_words:
+    for i, word in enumerate(snapshot.words.top_k(prefix, INLINE_RESULTS_LIMIT)):
         word = word.capitalize()
         res.append(
             types.InlineQueryResultArticle(
-                id=str(uuid4()),
+                id=str(i),  # Only needs to be unique within the results
                 title=word,
                 input_message_content=types.InputTextMessageContent(word)
             )
         )
-        if len(res) == 50:  # Max 50 results
-            break
 
     if not res:  # No results
         res.append(
             types.InlineQueryResultArticle(
-                id=str(uuid4()),
+                id="0",
                 title="No results found",
                 description="Try a different query",
                 input_message_content=types.InputTextMessageContent(r"¯\\_(ツ)\_/¯")
             )
         )
 
-    await inline_query.answer(res, is_personal=True)
+    inline_results_cache.put(key, res)
+    return res
 
 
-@dp.callback_query_handler()
+@dp.callback_query_handler(text_startswith="donate")
 async def callback_query_handler(callback_query: types.CallbackQuery) -> None:
     text = callback_query.data
-    if text.startswith("donate"):
-        await send_donate_invoice(callback_query.from_user.id, int(text.partition(":")[2]) * 100)
+    await send_donate_invoice(callback_query.from_user.id, int(text.partition(":")[2]) * 100)
     await callback_query.answer()
 
 
@@ -251,6 +262,7 @@ async def error_handler(update: types.Update, error: TelegramAPIError) -> None:
             )
         )
         GlobalState.games[group_id].state = GameState.KILLGAME
+        GlobalState.games[group_id].wake()
         await asyncio.sleep(2)
 
         # If game is still not terminated
@@ -1,12 +1,56 @@
 import asyncio
+import io
+import re
 import time
+from string import ascii_lowercase
+from typing import Optional, Tuple
 
 from aiogram import types
+from aiogram.utils.exceptions import MessageNotModified
+from aiogram.utils.markdown import quote_html
 
-from .. import bot, dp, pool
+from .. import bot, db, dp
 from ..constants import WORD_ADDITION_CHANNEL_ID
-from ..utils import check_word_existence, has_star, is_word, send_admin_group
-from ..words import Words
+from ..utils import check_word_existence, has_star, is_word, send_admin_group, send_groups_only_message
+from ..words import GroupOverlays, Words
+
+MAX_PATTERN_LENGTH = 40  # Keeps pagination callback data within Telegram's 64 bytes
+PATTERN_RESULTS_LIMIT = 1000
+PATTERN_PAGE_SIZE = 100
+MAX_ANAGRAM_LENGTH = 30
+ANAGRAM_RESULTS_LIMIT = 100
+MAX_GROUP_WORDS = 1000  # Per group, so that overlays stay small
+GROUP_WORDS_SHOWN = 100  # Of each list, within Telegram's message length limit
+
+
+def is_pattern(s: str) -> bool:
+    return 0 < len(s) <= MAX_PATTERN_LENGTH and all(c in ascii_lowercase or c in "?*" for c in s)
+
+
+def render_pattern_page(pattern: str, page: int) -> Tuple[str, Optional[types.InlineKeyboardMarkup]]:
+    """Text and pagination buttons of a page of the words matching pattern. Pages start from 1."""
+    words = Words.snapshot.words.match_pattern(pattern, PATTERN_RESULTS_LIMIT + 1)
+    if not words:
+        return f"No words match <code>{pattern}</code>.", None
+
+    capped = len(words) > PATTERN_RESULTS_LIMIT
+    words = words[:PATTERN_RESULTS_LIMIT]
+    pages = (len(words) + PATTERN_PAGE_SIZE - 1) // PATTERN_PAGE_SIZE
+    page = min(max(page, 1), pages)
+    text = (
+        f"Words matching <code>{pattern}</code> ({len(words)}{'+' if capped else ''}):\n"
+        + ", ".join(quote_html(w) for w in words[(page - 1) * PATTERN_PAGE_SIZE:page * PATTERN_PAGE_SIZE])
+    )
+    if pages == 1:
+        return text, None
+
+    text += f"\n\nPage {page}/{pages}"
+    buttons = []
+    if page > 1:
+        buttons.append(types.InlineKeyboardButton("\u25c0\ufe0f", callback_data=f"pattern:{page - 1}:{pattern}"))
+    if page < pages:
+        buttons.append(types.InlineKeyboardButton("\u25b6\ufe0f", callback_data=f"pattern:{page + 1}:{pattern}"))
+    return text, types.InlineKeyboardMarkup(inline_keyboard=[buttons])
 
 
 @dp.message_handler(commands=["exist", "exists"])
@@ -32,6 +76,63 @@ async def cmd_exists(message: types.Message) -> None:
     )
 
 
+@dp.message_handler(commands="pattern")
+async def cmd_pattern(message: types.Message) -> None:
+    pattern = re.sub(r"\*+", "*", message.get_args().lower())
+    if not is_pattern(pattern):
+        await message.reply(
+            (
+                "Function: Find words in my dictionary matching a pattern, "
+                "where `?` stands for any letter and `*` for any number of letters.\n"
+                "Usage: `/pattern c?a*e`"
+            ),
+            allow_sending_without_reply=True
+        )
+        return
+
+    text, reply_markup = render_pattern_page(pattern, 1)
+    await message.reply(
+        text, parse_mode=types.ParseMode.HTML, reply_markup=reply_markup, allow_sending_without_reply=True
+    )
+
+
+@dp.callback_query_handler(text_startswith="pattern:")
+async def pattern_page_callback(callback_query: types.CallbackQuery) -> None:
+    _, page, pattern = callback_query.data.split(":", 2)
+    text, reply_markup = render_pattern_page(pattern, int(page))
+    try:
+        await callback_query.message.edit_text(text, parse_mode=types.ParseMode.HTML, reply_markup=reply_markup)
+    except MessageNotModified:  # Pressed twice
+        pass
+    await callback_query.answer()
+
+
+@dp.message_handler(commands="anagram")
+async def cmd_anagram(message: types.Message) -> None:
+    letters = message.get_args().lower().replace(" ", "")
+    if not letters or len(letters) > MAX_ANAGRAM_LENGTH or not is_word(letters):
+        await message.reply(
+            (
+                "Function: Find anagrams of a word and the words that can be spelt with its letters.\n"
+                "Usage: `/anagram letters`"
+            ),
+            allow_sending_without_reply=True
+        )
+        return
+
+    words = Words.snapshot.words
+    anagrams = [w for w in words.anagrams(letters) if w != letters]
+    formable = [w for w in words.formable(letters, min_len=3) if len(w) < len(letters)]
+    text = (
+        f"Anagrams of <b>{letters}</b>: {', '.join(anagrams) if anagrams else 'None'}\n\n"
+        f"Words from its letters ({len(formable)}): "
+    )
+    text += ", ".join(formable[:ANAGRAM_RESULTS_LIMIT]) if formable else "None"
+    if len(formable) > ANAGRAM_RESULTS_LIMIT:
+        text += ", ..."
+    await message.reply(text, parse_mode=types.ParseMode.HTML, allow_sending_without_reply=True)
+
+
 @dp.message_handler(commands=["reqaddword", "reqaddwords"])
 async def cmd_reqaddword(message: types.Message) -> None:
     if message.forward_from:
@@ -63,8 +164,7 @@ async def cmd_reqaddword(message: types.Message) -> None:
             existing.append(f"_{w.capitalize()}_")
             words_to_add.remove(w)
 
-    async with pool.acquire() as conn:
-        rej = await conn.fetch("SELECT word, reason FROM wordlist WHERE NOT accepted;")
+    rej = await db.fetch("SELECT word, reason FROM wordlist WHERE NOT accepted;")
     for word, reason in rej:
         if word not in words_to_add:
             continue
@@ -115,8 +215,7 @@ async def cmd_addwords(message: types.Message) -> None:
             existing.append(f"_{w.capitalize()}_")
             words_to_add.remove(w)
 
-    async with pool.acquire() as conn:
-        rej = await conn.fetch("SELECT word, reason FROM wordlist WHERE NOT accepted;")
+    rej = await db.fetch("SELECT word, reason FROM wordlist WHERE NOT accepted;")
     for word, reason in rej:
         if word not in words_to_add:
             continue
@@ -129,8 +228,8 @@ async def cmd_addwords(message: types.Message) -> None:
 
     text = ""
     if words_to_add:
-        async with pool.acquire() as conn:
-            await conn.copy_records_to_table("wordlist", records=[(w, True, None) for w in words_to_add])
+        for w in words_to_add:
+            await db.execute("INSERT INTO wordlist (word, accepted, reason) VALUES (?, 1, NULL);", w)
         text += f"Added {', '.join([f'_{w.capitalize()}_' for w in words_to_add])} to the word list.\n"
     if existing:
         text += f"{', '.join(existing)} {'is' if len(existing) == 1 else 'are'} already in the word list.\n"
@@ -143,10 +242,11 @@ async def cmd_addwords(message: types.Message) -> None:
     if not words_to_add:
         return
 
+    # Added to the live word list without reloading it
     t = time.time()
-    await Words.update()
+    Words.add(words_to_add)
     asyncio.create_task(
-        msg.edit_text(msg.md_text + f"\n\nWord list updated. Time taken: `{time.time() - t:.3f}s`")
+        msg.edit_text(msg.md_text + f"\n\nWord list updated. Time taken: `{(time.time() - t) * 1000:.3f}ms`")
     )
     asyncio.create_task(
         bot.send_message(
@@ -165,14 +265,13 @@ async def cmd_rejword(message: types.Message) -> None:
         return
 
     word = word.lower()
-    async with pool.acquire() as conn:
-        r = await conn.fetchrow("SELECT accepted, reason FROM wordlist WHERE word = $1;", word)
-        if r is None:
-            await conn.execute(
-                "INSERT INTO wordlist (word, accepted, reason) VALUES ($1, false, $2)",
-                word,
-                reason.strip() or None
-            )
+    r = await db.fetchrow("SELECT accepted, reason FROM wordlist WHERE word = ?;", word)
+    if r is None:
+        await db.execute(
+            "INSERT INTO wordlist (word, accepted, reason) VALUES (?, 0, ?);",
+            word,
+            reason.strip() or None
+        )
 
     word = word.capitalize()
     if r is None:
@@ -186,3 +285,89 @@ async def cmd_rejword(message: types.Message) -> None:
             f"_{word}_ was already rejected. Reason: {r['reason']}.",
             allow_sending_without_reply=True
         )
+
+
+async def set_group_words(message: types.Message, allowed: Optional[bool]) -> None:
+    words = sorted(w for w in set(message.get_args().lower().split()) if is_word(w))
+    if not words:
+        await message.reply("where words", allow_sending_without_reply=True)
+        return
+
+    if allowed is not None:
+        overlay = await GroupOverlays.get(message.chat.id)
+        if len(overlay.allowed | overlay.blocked | set(words)) > MAX_GROUP_WORDS:
+            await message.reply(
+                f"Groups can allow or block at most {MAX_GROUP_WORDS} words.", allow_sending_without_reply=True
+            )
+            return
+
+    await GroupOverlays.set_words(message.chat.id, words, allowed)
+    action = "Allowed" if allowed else "Blocked" if allowed is not None else "Removed"
+    await message.reply(
+        f"{action} {', '.join(f'_{w.capitalize()}_' for w in words)}"
+        + (" in this group." if allowed is not None else " from this group's allowed and blocked words.")
+        + " Games already running are not affected.",
+        allow_sending_without_reply=True
+    )
+
+
+@dp.message_handler(is_admin=True, commands=["allowword", "allowwords"])
+async def cmd_allowwords(message: types.Message) -> None:
+    # Accept words missing from the word list in this group's games
+    await set_group_words(message, True)
+
+
+@dp.message_handler(is_admin=True, commands=["blockword", "blockwords"])
+async def cmd_blockwords(message: types.Message) -> None:
+    # Reject words in the word list in this group's games
+    await set_group_words(message, False)
+
+
+@dp.message_handler(is_admin=True, commands=["unlistword", "unlistwords"])
+async def cmd_unlistwords(message: types.Message) -> None:
+    await set_group_words(message, None)
+
+
+@dp.message_handler(commands="groupwords")
+@send_groups_only_message
+async def cmd_groupwords(message: types.Message) -> None:
+    overlay = await GroupOverlays.get(message.chat.id)
+    if not overlay.allowed and not overlay.blocked:
+        await message.reply(
+            "This group plays with my word list as it is. Admins can change that with /allowword and /blockword.",
+            allow_sending_without_reply=True
+        )
+        return
+
+    text = ""
+    for title, words in (("Allowed", overlay.allowed), ("Blocked", overlay.blocked)):
+        if words:
+            text += f"<b>{title}</b> ({len(words)}): " + ", ".join(
+                quote_html(w) for w in sorted(words)[:GROUP_WORDS_SHOWN]
+            ) + ("..." if len(words) > GROUP_WORDS_SHOWN else "") + "\n"
+    await message.reply(text, parse_mode=types.ParseMode.HTML, allow_sending_without_reply=True)
+
+
+@dp.message_handler(is_owner=True, commands="letterstats")
+async def cmd_letterstats(message: types.Message) -> None:
+    # Word counts by first and last letter for balancing game modes, at a minimum length if given
+    arg = message.get_args()
+    min_len = int(arg) if arg.isdecimal() and int(arg) > 0 else 1
+    stats = Words.snapshot.stats
+
+    lines = [f"<b>Letters of words with at least {min_len} letters</b> (start - end - difficulty)"]
+    for c in ascii_lowercase:
+        lines.append(
+            f"<code>{c.upper()} {stats.starting_with(c, min_len):>7} {stats.ending_with(c, min_len):>7} "
+            f"{stats.difficulty(c):5.2f}</code>"
+        )
+    await message.reply("\n".join(lines), parse_mode=types.ParseMode.HTML, allow_sending_without_reply=True)
+
+    # Too large for a message, rows are first letters and columns last letters
+    rows = ["," + ",".join(ascii_lowercase)]
+    for a in ascii_lowercase:
+        rows.append(a + "," + ",".join(str(stats.between(a, b, min_len)) for b in ascii_lowercase))
+    await message.reply_document(
+        types.InputFile(io.BytesIO("\n".join(rows).encode()), filename=f"transitions_{min_len}.csv"),
+        allow_sending_without_reply=True
+    )
@@ -1,5 +1,5 @@
 from .game import (BannedLettersGame, ChaosGame, ChosenFirstLetterGame, ClassicGame, EliminationGame, GAME_MODES,
-                   HardModeGame, MixedEliminationGame, RequiredLetterGame)
+                   HardModeGame, MixedEliminationGame, RequiredLetterGame, ReverseChainGame, TwoLetterChainGame)
 from .player import Player
 
 __all__ = (
@@ -10,6 +10,8 @@ __all__ = (
     "ChosenFirstLetterGame",
     "BannedLettersGame",
     "RequiredLetterGame",
+    "ReverseChainGame",
+    "TwoLetterChainGame",
     "EliminationGame",
     "MixedEliminationGame",
     "GAME_MODES"
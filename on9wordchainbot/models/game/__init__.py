@@ -7,6 +7,8 @@ from .hard_mode import HardModeGame
 from .mixed_elimination import MixedEliminationGame
 from .random_first_letter import RandomFirstLetterGame
 from .required_letter import RequiredLetterGame
+from .reverse_chain import ReverseChainGame
+from .two_letter_chain import TwoLetterChainGame
 
 GAME_MODES = [
     ClassicGame,
@@ -16,6 +18,8 @@ GAME_MODES = [
     RandomFirstLetterGame,
     BannedLettersGame,
     RequiredLetterGame,
+    ReverseChainGame,
+    TwoLetterChainGame,
     EliminationGame,
     MixedEliminationGame
 ]
@@ -28,6 +32,8 @@ __all__ = (
     "RandomFirstLetterGame",
     "BannedLettersGame",
     "RequiredLetterGame",
+    "ReverseChainGame",
+    "TwoLetterChainGame",
     "EliminationGame",
     "MixedEliminationGame",
     "GAME_MODES"
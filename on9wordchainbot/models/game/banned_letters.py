@@ -1,11 +1,12 @@
 import random
 from datetime import datetime
 from string import ascii_lowercase
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from aiogram import types
 
 from .classic import ClassicGame
+from ...dictionary import AnswerCounts
 from ...utils import get_random_word
 
 
@@ -28,6 +29,7 @@ class BannedLettersGame(ClassicGame):
                 f"include <b>at least {self.min_letters_limit} "
                 f"letter{'' if self.min_letters_limit == 1 else 's'}</b>.\n"
                 f"You have <b>{self.time_limit}s</b> to answer.\n"
+                f"{self.possible_answers_text()}"
                 f"Players remaining: {len(self.players_in_game)}/{len(self.players)}\n"
                 f"Total words: {self.turns}"
             ),
@@ -42,12 +44,12 @@ class BannedLettersGame(ClassicGame):
         if self.players_in_game[0].is_vp:
             await self.vp_answer()
 
-    def get_random_valid_answer(self) -> Optional[str]:
-        return get_random_word(
-            min_len=self.min_letters_limit,
-            prefix=self.current_word[-1],
-            banned_letters=self.banned_letters,
-            exclude_words=self.used_words
+    def answer_constraints(self) -> Dict[str, Any]:
+        return dict(super().answer_constraints(), banned_letters=self.banned_letters)
+
+    def count_answers(self) -> Optional[AnswerCounts]:
+        return AnswerCounts.from_words(
+            self.used_words.words, self.min_letters_limit, self.banned_letters, self.used_words
         )
 
     async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
@@ -82,7 +84,8 @@ class BannedLettersGame(ClassicGame):
 
         # Random starting word
         self.current_word = get_random_word(
-            min_len=self.min_letters_limit, banned_letters=self.banned_letters
+            min_len=self.min_letters_limit, banned_letters=self.banned_letters, exclude_words=self.used_words,
+            snapshot=self.snapshot
         )
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
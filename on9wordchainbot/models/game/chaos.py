@@ -18,6 +18,7 @@ class ChaosGame(ClassicGame):
                 f"Your word must start with <i>{self.current_word[-1].upper()}</i> and "
                 f"contain <b>at least {self.min_letters_limit} letters</b>.\n"
                 f"You have <b>{self.time_limit}s</b> to answer.\n"
+                f"{self.possible_answers_text()}"
                 f"Players remaining: {len(self.players_in_game)}/{len(self.players)}\n"
                 f"Total words: {self.turns}"
             ),
@@ -34,7 +35,9 @@ class ChaosGame(ClassicGame):
 
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word(min_len=self.min_letters_limit)
+        self.current_word = get_random_word(
+            min_len=self.min_letters_limit, exclude_words=self.used_words, snapshot=self.snapshot
+        )
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
@@ -49,12 +52,12 @@ class ChaosGame(ClassicGame):
             # Choose random player excluding the one who just answered
             player = self.players_in_game.pop(random.randint(0, len(self.players_in_game) - 2))
         else:
-            self.time_left -= 1
-            if self.time_left > 0:
+            if self.time_left > 0:  # Woken before the turn is over
                 return False
 
             # Timer ran out
             self.accepting_answers = False
+            self.cancel_vp_answer()
             await self.send_message(
                 f"{self.players_in_game[0].mention} ran out of time! They have been eliminated.",
                 parse_mode=types.ParseMode.HTML
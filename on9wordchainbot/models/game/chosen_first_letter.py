@@ -1,7 +1,9 @@
 import random
 from datetime import datetime
 from string import ascii_lowercase
+from typing import Optional
 
+import numpy as np
 from aiogram import types
 
 from .classic import ClassicGame
@@ -25,3 +27,7 @@ class ChosenFirstLetterGame(ClassicGame):
             ),
             parse_mode=types.ParseMode.HTML
         )
+
+    def vp_followers(self) -> Optional[np.ndarray]:
+        # Every answer starts with the chosen first letter whatever the previous one ends with
+        return None
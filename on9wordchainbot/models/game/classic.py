@@ -1,8 +1,14 @@
 import asyncio
+import logging
+import math
 import random
+import time
+from collections import deque
 from datetime import datetime
-from typing import Any, List, Optional, Set
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
+import numpy as np
 from aiocache import cached
 from aiogram import types
 from aiogram.utils.exceptions import BadRequest
@@ -10,7 +16,20 @@ from aiogram.utils.exceptions import BadRequest
 from ..player import Player
 from ... import GlobalState, bot, on9bot, db
 from ...constants import GameSettings, GameState, OWNER_ID
-from ...utils import ADD_ON9BOT_TO_GROUP_KEYBOARD, check_word_existence, get_random_word, send_admin_group
+from ...dictionary import DEFAULT_VP_TIER, VP_TIERS, AnswerCounts, UsedWords
+from ...scheduler import Timer, scheduler
+from ...utils import (ADD_ON9BOT_TO_GROUP_KEYBOARD, check_word_existence, count_words, get_random_word,
+                      get_vp_word, send_admin_group, suggest_words)
+from ...words import EMPTY_OVERLAY, GroupOverlays, Snapshot, Words
+
+logger = logging.getLogger(__name__)
+
+
+def timed_search(search: Callable[[], Optional[str]]) -> Tuple[Optional[str], float]:
+    # Answer found by search and the seconds it took, for running in a worker thread
+    t = time.perf_counter()
+    word = search()
+    return word, time.perf_counter() - t
 
 
 class ClassicGame:
@@ -19,11 +38,15 @@ class ClassicGame:
 
     __slots__ = (
         "group_id", "players", "players_in_game", "state", "start_time", "end_time",
-        "extended_user_ids", "min_players", "max_players", "time_left", "time_limit",
+        "extended_user_ids", "min_players", "max_players", "time_limit",
         "min_letters_limit", "current_word", "longest_word", "longest_word_sender_id",
-        "answered", "accepting_answers", "turns", "used_words", "join_lock"
+        "answered", "accepting_answers", "turns", "used_words", "answer_counts", "snapshot", "overlay",
+        "vp_tier", "vp_task", "deadline", "timers", "reminder", "wakeup", "join_lock"
     )
 
+    # Seconds taken to find the virtual player's recent answers, across games
+    vp_answer_seconds: Deque[float] = deque(maxlen=1000)
+
     def __init__(self, group_id: int) -> None:
         self.group_id = group_id
         self.players: List[Player] = []
@@ -34,6 +57,13 @@ class ClassicGame:
         # Store user ids rather than Player object since players may quit then join to extend again
         self.extended_user_ids: Set[int] = set()
 
+        # The scheduler wakes main_loop when the joining phase or the current turn is due to end,
+        # or a reminder to /join is, as do answers and /killgame
+        self.deadline = 0.0
+        self.timers: List[Timer] = []
+        self.reminder: Optional[int] = None
+        self.wakeup = asyncio.Event()
+
         # Game settings
         self.min_players = GameSettings.MIN_PLAYERS
         self.max_players = GameSettings.MAX_PLAYERS
@@ -48,10 +78,61 @@ class ClassicGame:
         self.answered = False
         self.accepting_answers = False
         self.turns = 0
-        self.used_words: Set[str] = set()
+        # Bound to the game's word list, which is only known once it starts
+        self.used_words = UsedWords(Words.snapshot.words)
+        # Unused valid answers by first letter, kept up to date as words are used
+        self.answer_counts: Optional[AnswerCounts] = None
+        # Word list snapshot the game is pinned to once running, None to follow the current one
+        self.snapshot: Optional[Snapshot] = None
+        # Words the group allows or blocks, loaded once the game starts
+        self.overlay = EMPTY_OVERLAY
+        # How well the virtual player plays, set with /addvp
+        self.vp_tier = DEFAULT_VP_TIER
+        # Virtual player's turn in progress
+        self.vp_task: Optional[asyncio.Task] = None
 
         self.join_lock = asyncio.Lock()  # Prevent same user / vp joining as multiple players
 
+    @property
+    def time_left(self) -> int:
+        # Seconds until the joining phase or the current turn ends, 0 once it is over
+        return max(0, math.ceil(round(self.deadline - scheduler.time(), 6)))
+
+    @time_left.setter
+    def time_left(self, seconds: int) -> None:
+        # Replaces the timers of the previous deadline
+        self.cancel_timers()
+        self.deadline = scheduler.time() + seconds
+        if self.state == GameState.JOINING:
+            self.timers.append(scheduler.call_at(self.deadline, self.wake, "joining"))
+            for reminder in GameSettings.JOINING_REMINDER_SECONDS:
+                if reminder < seconds:
+                    self.timers.append(
+                        scheduler.call_at(self.deadline - reminder, lambda r=reminder: self.remind(r), "reminder")
+                    )
+        else:
+            self.timers.append(scheduler.call_at(self.deadline, self.wake, "turn"))
+
+    def cancel_timers(self) -> None:
+        for timer in self.timers:
+            timer.cancel()
+        self.timers.clear()
+
+    def wake(self) -> None:
+        self.wakeup.set()
+
+    def timer_stuck(self) -> bool:
+        # Whether nothing is moving the game on: its deadline is still to come with no timer left to wake it,
+        # or passed over a second ago with the timer not firing or the main loop not taking the wakeup
+        now = scheduler.time()
+        if self.deadline > now:
+            return not any(timer.pending for timer in self.timers)
+        return now - self.deadline > 1 and (self.wakeup.is_set() or any(timer.pending for timer in self.timers))
+
+    def remind(self, seconds: int) -> None:
+        self.reminder = seconds
+        self.wake()
+
     def user_in_game(self, user_id: int) -> bool:
         return any(p.user_id == user_id for p in self.players)
 
@@ -71,7 +152,7 @@ class ClassicGame:
                 return
 
             # Try to detect game not starting
-            if self.time_left < 0:
+            if self.timer_stuck():
                 asyncio.create_task(self.scan_for_stale_timer())
                 return
 
@@ -91,7 +172,7 @@ class ClassicGame:
 
             # Start game when max players reached
             if len(self.players) >= self.max_players:
-                self.time_left = -99999
+                self.time_left = 0
 
     async def forcejoin(self, message: types.Message) -> None:
         async with self.join_lock:
@@ -120,7 +201,7 @@ class ClassicGame:
 
             # Start game when max players reached
             if len(self.players) >= self.max_players:
-                self.time_left = -99999
+                self.time_left = 0
 
     async def _acquire_lock_and_flee(self, message: types.Message) -> None:
         """Helper method to acquire lock and process flee."""
@@ -231,6 +312,11 @@ class ClassicGame:
             if any(p.is_vp for p in self.players):
                 return
 
+            tier = message.get_args().lower() or DEFAULT_VP_TIER
+            if tier not in VP_TIERS:
+                await self.send_message(f"Usage: /addvp [{' | '.join(VP_TIERS)}]")
+                return
+
             # Check if vp adder is player/admin/owner
             if (
                 message.from_user.id != OWNER_ID
@@ -253,11 +339,12 @@ class ClassicGame:
 
             vp = await Player.vp()
             self.players.append(vp)
+            self.vp_tier = tier
 
             await on9bot.send_message(self.group_id, "/join@" + (await bot.me).username)
             await self.send_message(
                 (
-                    f"{vp.name} joined. There {'is' if len(self.players) == 1 else 'are'} now "
+                    f"{vp.name} joined ({tier}). There {'is' if len(self.players) == 1 else 'are'} now "
                     f"{len(self.players)} player{'' if len(self.players) == 1 else 's'}."
                 ),
                 parse_mode=types.ParseMode.HTML
@@ -265,7 +352,7 @@ class ClassicGame:
 
             # Start game when max players reached
             if len(self.players) >= self.max_players:
-                self.time_left = -99999
+                self.time_left = 0
 
     async def remvp(self, message: types.Message) -> None:
         async with self.join_lock:
@@ -342,7 +429,7 @@ class ClassicGame:
 
             if n >= self.time_left:
                 # Start game immediately
-                self.time_left = -99999
+                self.time_left = 0
             else:
                 self.time_left -= n
                 await self.send_message(
@@ -366,6 +453,7 @@ class ClassicGame:
                 f"Your word must start with <i>{self.current_word[-1].upper()}</i> and "
                 f"include <b>at least {self.min_letters_limit} letters</b>.\n"
                 f"You have <b>{self.time_limit}s</b> to answer.\n"
+                f"{self.possible_answers_text()}"
                 f"Players remaining: {len(self.players_in_game)}/{len(self.players)}\n"
                 f"Total words: {self.turns}"
             ),
@@ -380,19 +468,144 @@ class ClassicGame:
         if self.players_in_game[0].is_vp:
             await self.vp_answer()
 
+    def count_answers(self) -> Optional[AnswerCounts]:
+        # To be overridden by game modes with other constraints on answers
+        # None: Answers cannot be counted by first letter and length alone
+        return AnswerCounts.from_words(self.used_words.words, self.min_letters_limit, exclude=self.used_words)
+
+    def possible_answers(self) -> Optional[int]:
+        # Number of valid answers for the current turn, None if not counted
+        if self.answer_counts is None:
+            return None
+        return self.answer_counts.remaining_for(self.current_word[-1])
+
+    def possible_answers_text(self) -> str:
+        n = self.possible_answers()
+        if n is None:
+            return ""
+        return f"There {'is' if n == 1 else 'are'} {n} possible answer{'' if n == 1 else 's'}.\n"
+
+    def answer_constraints(self) -> Dict[str, Any]:
+        # Constraints on answers in the current turn, as arguments to get_random_word
+        # To be extended by other game modes
+        return dict(min_len=self.min_letters_limit, prefix=self.current_word[-1], exclude_words=self.used_words)
+
+    def reroll_constraints(self) -> bool:
+        # Pick new random constraints on answers for the current turn, False if there are none
+        # To be overridden by game modes with random constraints that change every turn,
+        # constraints announced for the whole game or round are kept
+        return False
+
+    def has_enough_answers(self) -> bool:
+        # Looked up in the answer counts if kept, otherwise counted no further than needed,
+        # which usually takes microseconds
+        n = self.possible_answers()
+        if n is None:
+            n = count_words(
+                **self.answer_constraints(), snapshot=self.snapshot, limit=GameSettings.MIN_POSSIBLE_ANSWERS
+            )
+        return n >= GameSettings.MIN_POSSIBLE_ANSWERS
+
+    def ensure_possible_answers(self) -> None:
+        # Re-roll random constraints until the current turn has enough valid answers or the budget runs out,
+        # so that no player is given an impossible turn
+        for _ in range(GameSettings.MAX_CONSTRAINT_REROLLS):
+            if self.has_enough_answers() or not self.reroll_constraints():
+                return
+
     def get_random_valid_answer(self) -> Optional[str]:
-        return get_random_word(
-            min_len=self.min_letters_limit,
-            prefix=self.current_word[-1],
-            exclude_words=self.used_words
-        )
+        return get_random_word(**self.answer_constraints(), snapshot=self.snapshot)
+
+    def get_random_start_word(self) -> str:
+        # To be overridden by game modes that need particular starting words
+        # Avoid words few others follow, such as those ending with X in hard mode
+        stats = (self.snapshot or Words.snapshot).stats
+        for _ in range(GameSettings.START_WORD_ATTEMPTS):
+            word = get_random_word(
+                min_len=self.min_letters_limit, exclude_words=self.used_words, snapshot=self.snapshot
+            )
+            followers = stats.starting_with(word[-1], self.min_letters_limit) if word else 0
+            if not word or followers >= GameSettings.MIN_START_WORD_FOLLOWERS:
+                break
+        return word
+
+    def not_in_word_list_text(self, word: str) -> str:
+        # Suggest valid answers in case of a typo
+        text = f"_{word.capitalize()}_ is not in my list of words."
+        suggestions = suggest_words(word, **self.answer_constraints(), snapshot=self.snapshot)
+        if suggestions:
+            text += f" Did you mean {' or '.join(f'_{w.capitalize()}_' for w in suggestions)}?"
+        return text
+
+    def vp_followers(self) -> Optional[np.ndarray]:
+        # Answers the next player would have by the letter the virtual player's answer ends with,
+        # unused ones if counted, None if the next answer does not start with that letter
+        # To be overridden by game modes with other chaining rules
+        if self.answer_counts is not None:
+            return self.answer_counts.remaining
+        return (self.snapshot or Words.snapshot).stats.starting_counts(self.min_letters_limit)
+
+    def vp_constraints(self) -> Dict[str, Any]:
+        # Constraints on answers in the current turn for a search in a worker thread,
+        # with copies of the used words and banned letters, which the game goes on changing
+        snapshot = self.snapshot or Words.snapshot
+        constraints = self.answer_constraints()
+        used_words = constraints["exclude_words"]
+        used_words.rebind(snapshot.words)
+        constraints.update(exclude_words=used_words.copy(), snapshot=snapshot)
+        if constraints.get("banned_letters"):
+            constraints["banned_letters"] = list(constraints["banned_letters"])
+        return constraints
+
+    def vp_search(self) -> Callable[[], Optional[str]]:
+        # Search for the virtual player's answer given everything it reads from the game now,
+        # so that it can run in a worker thread without touching the game meanwhile
+        # Any valid answer on normal, otherwise one scored by how hard it is to follow
+        # To be overridden by game modes choosing answers otherwise
+        followers = self.vp_followers()
+        if self.vp_tier == DEFAULT_VP_TIER or followers is None:
+            return partial(get_random_word, **self.vp_constraints())
+        return partial(get_vp_word, VP_TIERS[self.vp_tier], followers.copy(), **self.vp_constraints())
 
     async def vp_answer(self) -> None:
-        # Wait before answering to prevent exceeding 20 msg/min message limit
-        # Also simulate thinking/input time like human players, wowzers
-        await asyncio.sleep(random.uniform(5, 8))
+        # Play in the background, so that the timer keeps running and the turn can be skipped meanwhile
+        self.cancel_vp_answer()
+        self.vp_task = asyncio.create_task(self.play_vp_turn())
+
+    def cancel_vp_answer(self) -> None:
+        # A search already running in the worker thread finishes on its own copies, but its answer is dropped
+        if self.vp_task is not None:
+            self.vp_task.cancel()
+            self.vp_task = None
+
+    async def play_vp_turn(self) -> None:
+        vp, turns = self.players_in_game[0], self.turns
+        # Search for the answer off the event loop while "thinking", known dead ends need no search
+        search = None
+        if self.possible_answers() != 0:
+            search = asyncio.get_running_loop().run_in_executor(None, timed_search, self.vp_search())
+        try:
+            # Wait before answering to prevent exceeding 20 msg/min message limit
+            # Also simulate thinking/input time like human players, wowzers
+            await asyncio.sleep(random.uniform(5, 8))
+            word = None
+            if search is not None:
+                word, seconds = await search
+                ClassicGame.vp_answer_seconds.append(seconds)
+        except asyncio.CancelledError:
+            if search is not None:
+                search.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Error finding virtual player answer in group {self.group_id}: {e}")
+            word = None
 
-        word = self.get_random_valid_answer()
+        # Turn ended some other way meanwhile
+        if not (
+            self.state == GameState.RUNNING and self.accepting_answers and self.turns == turns
+            and self.players_in_game and self.players_in_game[0] is vp
+        ):
+            return
 
         if not word:  # No valid words to choose from
             await on9bot.send_message(self.group_id, "/forceskip bey")
@@ -403,6 +616,18 @@ class ClassicGame:
 
         self.post_turn_processing(word)
         await self.send_post_turn_message(word)
+        self.wake()
+
+    async def chain_answer_checker(self, word: str, message: types.Message) -> bool:
+        # Whether word follows on from the current word
+        # To be overridden by game modes with other chaining rules
+        if not word.startswith(self.current_word[-1]):
+            await message.reply(
+                f"_{word.capitalize()}_ does not start with _{self.current_word[-1].upper()}_.",
+                allow_sending_without_reply=True
+            )
+            return False
+        return True
 
     async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
         # To be overridden by other game modes
@@ -416,11 +641,7 @@ class ClassicGame:
         word = message.text.lower()
 
         # Check if answer is invalid
-        if not word.startswith(self.current_word[-1]):
-            await message.reply(
-                f"_{word.capitalize()}_ does not start with _{self.current_word[-1].upper()}_.",
-                allow_sending_without_reply=True
-            )
+        if not await self.chain_answer_checker(word, message):
             return
         # No minimum letters limit for elimination game modes
         if not isinstance(self, EliminationGame) and len(word) < self.min_letters_limit:
@@ -432,17 +653,16 @@ class ClassicGame:
         if word in self.used_words:
             await message.reply(f"_{word.capitalize()}_ has been used.", allow_sending_without_reply=True)
             return
-        if not check_word_existence(word):
-            await message.reply(
-                f"_{word.capitalize()}_ is not in my list of words.",
-                allow_sending_without_reply=True
-            )
+        if not check_word_existence(word, self.snapshot, self.overlay):
+            await message.reply(self.not_in_word_list_text(word), allow_sending_without_reply=True)
             return
         if not await self.additional_answer_checkers(word, message):
             return
 
         self.post_turn_processing(word)
         await self.send_post_turn_message(word)
+        # Next turn once the answer is announced
+        self.wake()
 
     def post_turn_processing(self, word: str) -> None:
         # Prevent circular imports
@@ -450,6 +670,9 @@ class ClassicGame:
 
         # Update attributes
         self.used_words.add(word)
+        # Words only the group's overlay allows are not counted
+        if self.answer_counts is not None and word in self.used_words.words:
+            self.answer_counts.use(word)
         self.turns += 1
 
         # self.current_word is constant for ChosenFirstLetterGame
@@ -487,11 +710,13 @@ class ClassicGame:
                     f"*{self.min_letters_limit - GameSettings.WORD_LENGTH_LIMIT_INCREASE_PER_LIMIT_CHANGE}* "
                     f"to *{self.min_letters_limit}*.\n"
                 )
+                if self.answer_counts is not None:
+                    self.answer_counts.set_min_len(self.min_letters_limit)
         await self.send_message(text)
 
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word(min_len=self.min_letters_limit)
+        self.current_word = self.get_random_start_word()
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
@@ -512,12 +737,12 @@ class ClassicGame:
             # Move player who just answered to the end of queue
             self.players_in_game.append(self.players_in_game.pop(0))
         else:
-            self.time_left -= 1
-            if self.time_left > 0:
+            if self.time_left > 0:  # Woken before the turn is over
                 return False
 
             # Timer ran out
             self.accepting_answers = False
+            self.cancel_vp_answer()
             await self.send_message(
                 f"{self.players_in_game[0].mention} ran out of time! They have been eliminated.",
                 parse_mode=types.ParseMode.HTML
@@ -623,15 +848,14 @@ class ClassicGame:
 
     async def scan_for_stale_timer(self) -> None:
         # Check if game timer is stuck
-        timer = self.time_left
         for _ in range(5):
             await asyncio.sleep(1)
-            if timer != self.time_left and timer >= 0:
+            if not self.timer_stuck():
                 return  # Timer not stuck
             if self.state == GameState.KILLGAME or self.group_id not in GlobalState.games:
                 return  # Game already killed
 
-        await send_admin_group(f"Prolonged stale/negative timer detected in group `{self.group_id}`. Game terminated.")
+        await send_admin_group(f"Prolonged stuck timer detected in group `{self.group_id}`. Game terminated.")
         try:
             await self.send_message("Game timer is malfunctioning. Game terminated.")
         except:
@@ -640,8 +864,6 @@ class ClassicGame:
         GlobalState.games.pop(self.group_id, None)
 
     async def main_loop(self, message: types.Message) -> None:
-        # Attempt to fix issue of stuck game with negative timer.
-        negative_timer = 0
         try:
             await self.send_message(
                 f"A{'n' if self.name[0] in 'aeiou' else ''} {self.name} is starting.\n"
@@ -651,12 +873,14 @@ class ClassicGame:
             await self.join(message)
 
             while True:
-                await asyncio.sleep(1)
+                # Nothing to do until a timer fires, an answer is accepted or the game is killed
+                await self.wakeup.wait()
+                self.wakeup.clear()
                 if self.state == GameState.JOINING:
                     if self.time_left > 0:
-                        self.time_left -= 1
-                        if self.time_left in (15, 30, 60):
-                            await self.send_message(f"{self.time_left}s left to /join.")
+                        if self.reminder is not None:
+                            await self.send_message(f"{self.reminder}s left to /join.")
+                            self.reminder = None
                     elif len(self.players) < self.min_players:
                         await self.send_message("Not enough players. Game terminated.")
                         del GlobalState.games[self.group_id]
@@ -668,15 +892,18 @@ class ClassicGame:
                         random.shuffle(self.players)
                         self.players_in_game = self.players[:]
 
+                        # Keep the word list consistent for the whole game even if it is reloaded
+                        if GameSettings.PIN_WORD_LIST:
+                            self.snapshot = Words.snapshot
+                            self.used_words.rebind(self.snapshot.words)
+                        # Blocked words are excluded from answers like used ones
+                        self.overlay = await GroupOverlays.get(self.group_id)
+                        self.used_words.block(self.overlay.blocked)
+
                         await self.running_initialization()
+                        self.answer_counts = self.count_answers()
                         await self.send_turn_message()
                 elif self.state == GameState.RUNNING:
-                    # Check for prolonged negative timer
-                    if self.time_left < 0:
-                        negative_timer += 1
-                    if negative_timer >= 5:
-                        raise ValueError("Prolonged negative timer.")
-
                     if await self.running_phase_tick():  # True: Game ended
                         await self.update_db()
                         return
@@ -694,3 +921,11 @@ class ClassicGame:
             except:
                 pass
             raise
+        finally:
+            self.cancel_vp_answer()
+            self.cancel_timers()
+
+    async def cleanup(self) -> None:
+        # Called when the game is killed
+        self.cancel_vp_answer()
+        self.wake()
@@ -1,12 +1,13 @@
 from datetime import datetime
-from typing import Optional
+from functools import partial
+from typing import Callable, Optional
 
 from aiogram import types
 
 from .classic import ClassicGame
 from ..player import Player
 from ...constants import GameSettings, GameState
-from ...utils import get_random_word
+from ...utils import get_longest_word, get_random_word
 
 
 class EliminationGame(ClassicGame):
@@ -97,7 +98,9 @@ class EliminationGame(ClassicGame):
                 # Since they could be eliminated
                 + (f" (Next: {self.players_in_game[1].name})\n" if self.turns_until_elimination > 1 else "\n")
                 + f"Your word must start with <i>{self.current_word[-1].upper()}</i>.\n"
-                  f"You have <b>{self.time_limit}s</b> to answer.\n\n"
+                  f"You have <b>{self.time_limit}s</b> to answer.\n"
+                + self.possible_answers_text()
+                + "\n"
                   "Leaderboard:\n" + self.get_leaderboard(show_player=self.players_in_game[0])
             ),
             parse_mode=types.ParseMode.HTML
@@ -108,6 +111,13 @@ class EliminationGame(ClassicGame):
         self.accepting_answers = True
         self.time_left = self.time_limit
 
+        if self.players_in_game[0].is_vp:
+            await self.vp_answer()
+
+    def vp_search(self) -> Callable[[], Optional[str]]:
+        # Score is by length, so play long words whatever follows them
+        return partial(get_longest_word, GameSettings.ELIM_VP_WORD_LENGTHS[self.vp_tier], **self.vp_constraints())
+
     def post_turn_processing(self, word: str) -> None:
         super().post_turn_processing(word)
         self.players_in_game[0].score += min(len(word), GameSettings.ELIM_MAX_TURN_SCORE)
@@ -124,7 +134,7 @@ class EliminationGame(ClassicGame):
 
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word()
+        self.current_word = get_random_word(exclude_words=self.used_words, snapshot=self.snapshot)
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
@@ -141,10 +151,10 @@ class EliminationGame(ClassicGame):
 
     async def running_phase_tick(self) -> bool:
         if not self.answered:
-            self.time_left -= 1
-            if self.time_left > 0:
+            if self.time_left > 0:  # Woken before the turn is over
                 return False
             self.accepting_answers = False
+            self.cancel_vp_answer()
             await self.send_message(
                 f"{self.players_in_game[0].mention} ran out of time!",
                 parse_mode=types.ParseMode.HTML
@@ -1,6 +1,7 @@
 import random
 from datetime import datetime
 from string import ascii_lowercase
+from typing import Any, Dict, Optional
 
 from aiogram import types
 
@@ -9,6 +10,7 @@ from .chosen_first_letter import ChosenFirstLetterGame
 from .classic import ClassicGame
 from .elimination import EliminationGame
 from .required_letter import RequiredLetterGame
+from ...dictionary import AnswerCounts
 from ...utils import check_word_existence, get_random_word
 
 
@@ -35,7 +37,23 @@ class MixedEliminationGame(EliminationGame):
         self.banned_letters = []
         self.required_letter = None
 
+    def answer_constraints(self) -> Dict[str, Any]:
+        constraints = dict(
+            prefix=self.current_word[0] if self.game_mode is ChosenFirstLetterGame else self.current_word[-1],
+            exclude_words=self.used_words
+        )
+        if self.game_mode is BannedLettersGame:
+            constraints["banned_letters"] = self.banned_letters
+        elif self.game_mode is RequiredLetterGame:
+            constraints["required_letter"] = self.required_letter
+        return constraints
+
+    def count_answers(self) -> Optional[AnswerCounts]:
+        # Constraints change with the game mode every round
+        return None
+
     async def send_turn_message(self) -> None:
+        self.ensure_possible_answers()
         text = f"Turn: {self.players_in_game[0].mention}"
         if self.turns_until_elimination > 1:
             text += f" (Next: {self.players_in_game[1].name})"
@@ -62,6 +80,9 @@ class MixedEliminationGame(EliminationGame):
         self.accepting_answers = True
         self.time_left = self.time_limit
 
+        if self.players_in_game[0].is_vp:
+            await self.vp_answer()
+
     async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
         if self.game_mode is BannedLettersGame:
             return await BannedLettersGame.additional_answer_checkers(self, word, message)
@@ -90,17 +111,15 @@ class MixedEliminationGame(EliminationGame):
         if word in self.used_words:
             await message.reply(f"_{word.capitalize()}_ has been used.", allow_sending_without_reply=True)
             return
-        if not check_word_existence(word):
-            await message.reply(
-                f"_{word.capitalize()}_ is not in my list of words.",
-                allow_sending_without_reply=True
-            )
+        if not check_word_existence(word, self.snapshot, self.overlay):
+            await message.reply(self.not_in_word_list_text(word), allow_sending_without_reply=True)
             return
         if not await self.additional_answer_checkers(word, message):
             return
 
         self.post_turn_processing(word)
         await self.send_post_turn_message(word)
+        self.wake()
 
     def post_turn_processing(self, word: str) -> None:
         super().post_turn_processing(word)
@@ -117,12 +136,16 @@ class MixedEliminationGame(EliminationGame):
         # Set starting word and mode-based attributes
         if self.game_mode is BannedLettersGame:
             BannedLettersGame.set_banned_letters(self)
-            self.current_word = get_random_word(banned_letters=self.banned_letters)
+            self.current_word = get_random_word(
+                banned_letters=self.banned_letters, exclude_words=self.used_words, snapshot=self.snapshot
+            )
         elif self.game_mode is ChosenFirstLetterGame:
             # Ensure uniform probability of each letter as the starting letter
-            self.current_word = get_random_word(prefix=random.choice(ascii_lowercase))
+            self.current_word = get_random_word(
+                prefix=random.choice(ascii_lowercase), exclude_words=self.used_words, snapshot=self.snapshot
+            )
         else:
-            self.current_word = get_random_word()
+            self.current_word = get_random_word(exclude_words=self.used_words, snapshot=self.snapshot)
         if self.game_mode is RequiredLetterGame:
             RequiredLetterGame.change_required_letter(self)
         self.used_words.add(self.current_word)
@@ -157,6 +180,13 @@ class MixedEliminationGame(EliminationGame):
         elif self.game_mode is RequiredLetterGame:
             RequiredLetterGame.change_required_letter(self)
 
+    def reroll_constraints(self) -> bool:
+        # Banned letters are announced for the whole round, the required letter changes every turn anyway
+        if self.game_mode is RequiredLetterGame:
+            RequiredLetterGame.change_required_letter(self)
+            return True
+        return False
+
     async def handle_round_start(self) -> None:
         self.turns_until_elimination = len(self.players_in_game)
         self.set_game_mode()
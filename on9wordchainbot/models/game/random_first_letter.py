@@ -1,6 +1,8 @@
 import random
 from datetime import datetime
+from typing import Optional
 
+import numpy as np
 from aiogram import types
 
 from .classic import ClassicGame
@@ -14,12 +16,18 @@ class RandomFirstLetterGame(ClassicGame):
     def change_first_letter(self) -> None:
         self.current_word = random.choice(self.current_word)
 
+    def vp_followers(self) -> Optional[np.ndarray]:
+        # The next answer starts with a random letter of the previous one
+        return None
+
     def post_turn_processing(self, word: str) -> None:
         super().post_turn_processing(word)
         self.change_first_letter()
 
     async def running_initialization(self) -> None:
-        self.current_word = get_random_word(min_len=self.min_letters_limit)
+        self.current_word = get_random_word(
+            min_len=self.min_letters_limit, exclude_words=self.used_words, snapshot=self.snapshot
+        )
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
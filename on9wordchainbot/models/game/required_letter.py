@@ -1,11 +1,12 @@
 import random
 from datetime import datetime
 from string import ascii_lowercase
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from aiogram import types
 
 from .classic import ClassicGame
+from ...dictionary import AnswerCounts
 from ...utils import get_random_word
 
 
@@ -22,6 +23,7 @@ class RequiredLetterGame(ClassicGame):
         self.required_letter: Optional[str] = None  # Changes every turn
 
     async def send_turn_message(self) -> None:
+        self.ensure_possible_answers()
         await self.send_message(
             (
                 f"Turn: {self.players_in_game[0].mention} (Next: {self.players_in_game[1].name})\n"
@@ -43,13 +45,12 @@ class RequiredLetterGame(ClassicGame):
         if self.players_in_game[0].is_vp:
             await self.vp_answer()
 
-    def get_random_valid_answer(self) -> Optional[str]:
-        return get_random_word(
-            min_len=self.min_letters_limit,
-            prefix=self.current_word[-1],
-            required_letter=self.required_letter,
-            exclude_words=self.used_words
-        )
+    def answer_constraints(self) -> Dict[str, Any]:
+        return dict(super().answer_constraints(), required_letter=self.required_letter)
+
+    def count_answers(self) -> Optional[AnswerCounts]:
+        # The required letter changes every turn
+        return None
 
     async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
         if self.required_letter not in word:
@@ -65,13 +66,19 @@ class RequiredLetterGame(ClassicGame):
         letters.remove(self.current_word[-1])
         self.required_letter = random.choice(letters)
 
+    def reroll_constraints(self) -> bool:
+        self.change_required_letter()
+        return True
+
     def post_turn_processing(self, word: str) -> None:
         super().post_turn_processing(word)
         self.change_required_letter()
 
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word(min_len=self.min_letters_limit)
+        self.current_word = get_random_word(
+            min_len=self.min_letters_limit, exclude_words=self.used_words, snapshot=self.snapshot
+        )
         self.used_words.add(self.current_word)
         self.change_required_letter()
         self.start_time = datetime.now().replace(microsecond=0)
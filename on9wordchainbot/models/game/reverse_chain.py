@@ -0,0 +1,88 @@
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from aiogram import types
+
+from .classic import ClassicGame
+from ...dictionary import DEFAULT_VP_TIER, VP_TIERS, AnswerCounts
+from ...utils import get_random_word, get_vp_word
+from ...words import Words
+
+
+class ReverseChainGame(ClassicGame):
+    name = "reverse chain game"
+    command = "startrev"
+
+    # Answers must end with the first letter of the previous word
+
+    async def send_turn_message(self) -> None:
+        await self.send_message(
+            (
+                f"Turn: {self.players_in_game[0].mention} (Next: {self.players_in_game[1].name})\n"
+                f"Your word must <b>end</b> with <i>{self.current_word[0].upper()}</i> and "
+                f"include <b>at least {self.min_letters_limit} letters</b>.\n"
+                f"You have <b>{self.time_limit}s</b> to answer.\n"
+                f"{self.possible_answers_text()}"
+                f"Players remaining: {len(self.players_in_game)}/{len(self.players)}\n"
+                f"Total words: {self.turns}"
+            ),
+            parse_mode=types.ParseMode.HTML
+        )
+
+        # Reset per-turn attributes
+        self.answered = False
+        self.accepting_answers = True
+        self.time_left = self.time_limit
+
+        if self.players_in_game[0].is_vp:
+            await self.vp_answer()
+
+    def count_answers(self) -> Optional[AnswerCounts]:
+        return AnswerCounts.from_words(
+            self.used_words.words, self.min_letters_limit, exclude=self.used_words, by_last_letter=True
+        )
+
+    def possible_answers(self) -> Optional[int]:
+        if self.answer_counts is None:
+            return None
+        return self.answer_counts.remaining_for(self.current_word[0])
+
+    def answer_constraints(self) -> Dict[str, Any]:
+        return dict(min_len=self.min_letters_limit, suffix=self.current_word[0], exclude_words=self.used_words)
+
+    def vp_followers(self) -> Optional[np.ndarray]:
+        # The next answer ends with the first letter instead, so answers by the letter they end with
+        if self.answer_counts is not None:
+            return self.answer_counts.remaining
+        return (self.snapshot or Words.snapshot).stats.ending_counts(self.min_letters_limit)
+
+    def vp_search(self) -> Callable[[], Optional[str]]:
+        if self.vp_tier == DEFAULT_VP_TIER:
+            return super().vp_search()
+        return partial(
+            get_vp_word, VP_TIERS[self.vp_tier], self.vp_followers().copy(), **self.vp_constraints(),
+            by_first_letter=True
+        )
+
+    def get_random_start_word(self) -> str:
+        # Start with a letter that words end with about as often as they do in general,
+        # rather than one like Q that hardly any word ends with
+        word = get_random_word(snapshot=self.snapshot)
+        if not word:  # No words to choose from
+            return super().get_random_start_word()
+        return (
+            get_random_word(
+                min_len=self.min_letters_limit, prefix=word[-1], exclude_words=self.used_words, snapshot=self.snapshot
+            )
+            or super().get_random_start_word()
+        )
+
+    async def chain_answer_checker(self, word: str, message: types.Message) -> bool:
+        if not word.endswith(self.current_word[0]):
+            await message.reply(
+                f"_{word.capitalize()}_ does not end with _{self.current_word[0].upper()}_.",
+                allow_sending_without_reply=True
+            )
+            return False
+        return True
@@ -0,0 +1,163 @@
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from aiogram import types
+
+from .classic import ClassicGame
+from ...constants import GameSettings
+from ...dictionary import (DEFAULT_VP_TIER, VP_TIERS, AnswerCounts, BigramAnswerCounts, UsedWords, VPTier,
+                           bigram_index)
+from ...utils import get_random_word
+from ...words import Snapshot, Words
+
+logger = logging.getLogger(__name__)
+
+
+def leaves_answers(counts: Optional[AnswerCounts], word: str, min_len: int) -> bool:
+    # Whether the next player would have any valid answers at least min_len letters long after word
+    if counts is None:
+        return True
+    bigram = word[-2:]
+    remaining = counts.remaining_for(bigram, min_len)
+    if word.startswith(bigram) and len(word) >= min_len:  # Word itself is counted
+        remaining -= 1
+    return remaining > 0
+
+
+def get_answer(
+    tier: VPTier,
+    counts: Optional[AnswerCounts],
+    next_min_len: int,
+    min_len: int,
+    prefix: str,
+    exclude_words: UsedWords,
+    snapshot: Optional[Snapshot] = None
+) -> Optional[str]:
+    # Answer chosen as a virtual player of the given tier would among those leaving the next player answers
+    # at least next_min_len letters long, None if there are none
+    if tier == VP_TIERS[DEFAULT_VP_TIER] or counts is None:
+        # Few words end with a dead end, so a handful of random answers will usually include one that does not
+        for _ in range(GameSettings.ANSWER_SAMPLE_ATTEMPTS):
+            word = get_random_word(min_len, prefix, exclude_words=exclude_words, snapshot=snapshot)
+            if not word or leaves_answers(counts, word, next_min_len):
+                return word
+
+    # Otherwise list the answers starting with the two letters, leaving out dead ends
+    words = (snapshot or Words.snapshot).words
+    exclude_words.rebind(words)
+    ordinals = words.candidates(min_len, prefix, exclude=exclude_words)
+    answers = list(words.iter_ordinals(ordinals))
+    last_bigrams = np.array([bigram_index(w[-2:]) for w in answers], dtype=np.int64)
+    # Answers the next player would have by the two letters an answer ends with
+    followers = counts.remaining_at(next_min_len)
+    left = np.where(last_bigrams >= 0, followers[last_bigrams], 0)
+    # Including the answer itself if it starts with the two letters it ends with
+    left -= np.array([w.startswith(w[-2:]) and len(w) >= next_min_len for w in answers], dtype=np.int64)
+    kept = np.flatnonzero(left > 0)
+    if not len(kept):
+        return None
+    i = tier.choose(words.lengths_of(ordinals)[kept], last_bigrams[kept], followers, min_len)
+    return answers[kept[i]]
+
+
+class TwoLetterChainGame(ClassicGame):
+    name = "two letter chain game"
+    command = "starttl"
+
+    # Answers must start with the last two letters of the previous word.
+    # Words ending with two letters no remaining word starts with are rejected,
+    # so that no player is ever given a dead end like XQ.
+
+    async def send_turn_message(self) -> None:
+        await self.send_message(
+            (
+                f"Turn: {self.players_in_game[0].mention} (Next: {self.players_in_game[1].name})\n"
+                f"Your word must start with <i>{self.current_word[-2:].upper()}</i> and "
+                f"include <b>at least {self.min_letters_limit} letters</b>.\n"
+                f"You have <b>{self.time_limit}s</b> to answer.\n"
+                f"{self.possible_answers_text()}"
+                f"Players remaining: {len(self.players_in_game)}/{len(self.players)}\n"
+                f"Total words: {self.turns}"
+            ),
+            parse_mode=types.ParseMode.HTML
+        )
+
+        # Reset per-turn attributes
+        self.answered = False
+        self.accepting_answers = True
+        self.time_left = self.time_limit
+
+        if self.players_in_game[0].is_vp:
+            await self.vp_answer()
+
+    def count_answers(self) -> Optional[AnswerCounts]:
+        return BigramAnswerCounts.from_words(self.used_words.words, self.min_letters_limit, exclude=self.used_words)
+
+    def possible_answers(self) -> Optional[int]:
+        if self.answer_counts is None:
+            return None
+        return self.answer_counts.remaining_for(self.current_word[-2:])
+
+    def answer_constraints(self) -> Dict[str, Any]:
+        return dict(min_len=self.min_letters_limit, prefix=self.current_word[-2:], exclude_words=self.used_words)
+
+    def vp_followers(self) -> Optional[np.ndarray]:
+        # The next answer starts with the last two letters instead, which get_answer handles
+        return None
+
+    def next_min_letters_limit(self) -> int:
+        # Minimum word length in the next turn, as raised by send_post_turn_message
+        if (
+            (self.turns + 1) % GameSettings.TURNS_BETWEEN_LIMITS_CHANGE == 0
+            and self.min_letters_limit < GameSettings.MAX_WORD_LENGTH_LIMIT
+        ):
+            return self.min_letters_limit + GameSettings.WORD_LENGTH_LIMIT_INCREASE_PER_LIMIT_CHANGE
+        return self.min_letters_limit
+
+    def get_random_valid_answer(self) -> Optional[str]:
+        return get_answer(
+            VP_TIERS[DEFAULT_VP_TIER], self.answer_counts, self.next_min_letters_limit(),
+            **self.answer_constraints(), snapshot=self.snapshot
+        )
+
+    def vp_search(self) -> Callable[[], Optional[str]]:
+        # Scored by the answers the next player would have by the two letters an answer ends with
+        counts = self.answer_counts.copy() if self.answer_counts is not None else None
+        return partial(
+            get_answer, VP_TIERS[self.vp_tier], counts, self.next_min_letters_limit(), **self.vp_constraints()
+        )
+
+    def get_random_start_word(self) -> str:
+        # The first player must have answers too
+        words = self.used_words.words
+        for _ in range(GameSettings.START_WORD_ATTEMPTS):
+            word = super().get_random_start_word()
+            if not word:
+                return word
+            # Not counting the starting word itself, which will have been used
+            own = 1 if word.startswith(word[-2:]) else 0
+            n = words.count_candidates(self.min_letters_limit, word[-2:], exclude=self.used_words, limit=own + 1)
+            if n > own:
+                return word
+        logger.warning(f"No starting word found leaving answers in group {self.group_id}, starting with {word}")
+        return word
+
+    async def chain_answer_checker(self, word: str, message: types.Message) -> bool:
+        if not word.startswith(self.current_word[-2:]):
+            await message.reply(
+                f"_{word.capitalize()}_ does not start with _{self.current_word[-2:].upper()}_.",
+                allow_sending_without_reply=True
+            )
+            return False
+        return True
+
+    async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
+        if not leaves_answers(self.answer_counts, word, self.next_min_letters_limit()):
+            await message.reply(
+                f"No words left start with _{word[-2:].upper()}_, so _{word.capitalize()}_ cannot be used.",
+                allow_sending_without_reply=True
+            )
+            return False
+        return True
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import math
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Timers are rounded up to a whole number of ticks
+TICK_SECONDS = 0.1
+# Each level of the wheel has 2 ** SLOT_BITS slots, each spanning 2 ** SLOT_BITS slots of the level below
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+# Four levels cover 2 ** 24 ticks, about 19 days, longer timers are re-inserted until they are in range
+LEVELS = 4
+
+
+class Timer:
+    """A callback due at a loop time. Cancelling it before it is due removes it from the wheel."""
+
+    __slots__ = ("wheel", "due", "tick", "callback", "kind", "slot")
+
+    def __init__(self, wheel: "TimerWheel", due: float, tick: int, callback: Callable[[], None], kind: str) -> None:
+        self.wheel = wheel
+        self.due = due
+        self.tick = tick
+        self.callback = callback
+        self.kind = kind
+        self.slot: Optional[Dict["Timer", None]] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether the timer is yet to fire and not cancelled."""
+        return self.slot is not None
+
+    def cancel(self) -> None:
+        if self.slot is not None:
+            del self.slot[self]
+            self.slot = None
+            self.wheel.pending[self.kind] -= 1
+
+
+class TimerWheel:
+    """Hierarchical timer wheel firing the timers of every game from one event loop callback.
+
+    Level L slot i holds the timers due in ticks whose bits L * SLOT_BITS and up select slot i,
+    and which are less than ``SLOTS ** (L + 1)`` ticks away when inserted. Reaching the start of
+    a higher level slot re-inserts its timers lower down, so each timer moves at most LEVELS times.
+    The wheel only wakes for ticks with timers due or slots to re-insert, so idle games cost nothing.
+
+    Callbacks are plain functions, run in the event loop and expected to return quickly,
+    such as setting an event a game waits on. Firing lag, how late timers fire, is recorded.
+    """
+
+    def __init__(self) -> None:
+        self.levels: List[List[Dict[Timer, None]]] = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.tick = 0  # Every timer due in this tick or earlier has fired
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.handle: Optional[asyncio.TimerHandle] = None
+        self.wake_tick: Optional[int] = None
+        # Timers not fired or cancelled by kind
+        self.pending: Counter = Counter()
+        self.fired = 0
+        self.wakeups = 0
+        # Seconds the recently fired timers fired after they were due
+        self.lags: Deque[float] = deque(maxlen=1000)
+
+    def __len__(self) -> int:
+        return sum(self.pending.values())
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # Ticks count from the new loop's clock, timers left from another loop are kept as they are
+            timers = [timer for level in self.levels for slot in level for timer in slot]
+            for level in self.levels:
+                for slot in level:
+                    slot.clear()
+            self.loop, self.handle, self.wake_tick = loop, None, None
+            self.tick = math.floor(loop.time() / TICK_SECONDS)
+            for timer in timers:
+                self._insert(timer)
+        return loop
+
+    def call_at(self, due: float, callback: Callable[[], None], kind: str = "other") -> Timer:
+        """Call callback once the loop time is due, labelled kind in the pending counts."""
+        loop = self._bind()
+        if not len(self):
+            # Nothing can be skipped over, so catch up with the clock
+            self.tick = max(self.tick, math.floor(loop.time() / TICK_SECONDS))
+        timer = Timer(self, due, max(math.ceil(due / TICK_SECONDS), self.tick + 1), callback, kind)
+        self._insert(timer)
+        self.pending[kind] += 1
+        if self.wake_tick is None or timer.tick < self.wake_tick:
+            self._schedule_wakeup()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[[], None], kind: str = "other") -> Timer:
+        return self.call_at(self._bind().time() + delay, callback, kind)
+
+    def time(self) -> float:
+        return self._bind().time()
+
+    def _insert(self, timer: Timer) -> None:
+        delta = max(timer.tick - self.tick, 1)
+        level = min((delta.bit_length() - 1) // SLOT_BITS, LEVELS - 1)
+        # Too far for the top level, re-inserted when its slot comes round
+        tick = timer.tick if delta < SLOTS ** LEVELS else self.tick + SLOTS ** LEVELS - 1
+        slot = self.levels[level][(tick >> (level * SLOT_BITS)) & (SLOTS - 1)]
+        slot[timer] = None
+        timer.slot = slot
+
+    def _next_tick(self) -> Optional[int]:
+        # First tick after the current one with timers due or a slot to re-insert
+        first = None
+        for level in range(LEVELS):
+            shift = level * SLOT_BITS
+            current = self.tick >> shift
+            slots = self.levels[level]
+            for i in range(1, SLOTS + 1):
+                if slots[(current + i) & (SLOTS - 1)]:
+                    tick = (current + i) << shift
+                    first = tick if first is None else min(first, tick)
+                    break
+        return first
+
+    def _schedule_wakeup(self) -> None:
+        if self.handle is not None:
+            self.handle.cancel()
+        self.wake_tick = self._next_tick()
+        if self.wake_tick is not None:
+            self.handle = self.loop.call_at(self.wake_tick * TICK_SECONDS, self._run)
+        else:
+            self.handle = None
+
+    def _run(self) -> None:
+        # The tick woken for counts as reached even if rounding puts the clock just before it
+        now = self.loop.time()
+        now_tick = max(math.floor(now / TICK_SECONDS), self.wake_tick or 0)
+        self.handle = self.wake_tick = None
+        self.wakeups += 1
+        while True:
+            tick = self._next_tick()
+            if tick is None or tick > now_tick:
+                break
+            # Nothing is due before tick, so skip straight to it
+            self.tick = tick
+            for level in range(LEVELS - 1, 0, -1):
+                shift = level * SLOT_BITS
+                if tick & ((1 << shift) - 1) == 0:
+                    slot = self.levels[level][(tick >> shift) & (SLOTS - 1)]
+                    timers = list(slot)
+                    slot.clear()
+                    for timer in timers:
+                        self._insert(timer)
+            slot = self.levels[0][tick & (SLOTS - 1)]
+            timers = [timer for timer in slot if timer.tick <= tick]
+            for timer in timers:
+                timer.cancel()
+                self.fired += 1
+                self.lags.append(max(now - timer.due, 0.0))
+                try:
+                    timer.callback()
+                except Exception as e:
+                    logger.error(f"Error in {timer.kind} timer callback: {e}")
+        self.tick = max(self.tick, now_tick)
+        self._schedule_wakeup()
+
+    def stats(self) -> Dict[str, float]:
+        """Pending timers by kind, timers fired, wakeups and the recent firing lag in milliseconds."""
+        lags = list(self.lags)
+        return {
+            **{f"pending_{kind}": n for kind, n in sorted(self.pending.items()) if n},
+            "pending": len(self),
+            "fired": self.fired,
+            "wakeups": self.wakeups,
+            "lag_mean_ms": sum(lags) / len(lags) * 1000 if lags else 0.0,
+            "lag_max_ms": max(lags) * 1000 if lags else 0.0
+        }
+
+
+# Deadlines and reminders of every game
+scheduler = TimerWheel()
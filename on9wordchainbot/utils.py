@@ -1,29 +1,40 @@
 import logging
-import random
+from collections import OrderedDict
 from functools import wraps
 from string import ascii_lowercase
-from typing import Any, Callable, List, Optional, Set
+from typing import Any, Callable, Hashable, List, Optional, Set, Union
 
 logger = logging.getLogger(__name__)
 
+import numpy as np
 from aiocache import cached
 from aiogram import types
 
 from . import bot, on9bot, db
 from .constants import ADMIN_GROUP_ID, VIP
-from .words import Words
+from .dictionary import UsedWords, VPTier
+from .words import GroupOverlay, Snapshot, Words
 
 
 def is_word(s: str) -> bool:
     return all(c in ascii_lowercase for c in s)
 
 
-def check_word_existence(word: str) -> bool:
-    """Check if a word exists in the dictionary (case-insensitive)"""
+def check_word_existence(
+    word: str, snapshot: Optional[Snapshot] = None, overlay: Optional[GroupOverlay] = None
+) -> bool:
+    """Check if a word exists in the dictionary (case-insensitive), the current one unless snapshot is given,
+    with the words of a group's overlay allowed or blocked if given"""
     if not word or not isinstance(word, str):
         return False
+    words = (snapshot or Words.snapshot).words
     word = word.strip().lower()
-    return word in Words.words or word.capitalize() in Words.words
+    if overlay is not None:
+        if word in overlay.blocked:
+            return False
+        if word in overlay.allowed:
+            return True
+    return word in words or word.capitalize() in words
 
 
 def filter_words(
@@ -31,58 +42,167 @@ def filter_words(
     prefix: Optional[str] = None,
     required_letter: Optional[str] = None,
     banned_letters: Optional[List[str]] = None,
-    exclude_words: Optional[Set[str]] = None
+    exclude_words: Union[Set[str], UsedWords, None] = None,
+    snapshot: Optional[Snapshot] = None,
+    suffix: Optional[str] = None
 ) -> List[str]:
     """Filter words based on given criteria"""
     try:
-        # Get words with prefix if specified
-        if prefix:
-            prefix = prefix.lower()
-            words = Words.starts_with(prefix)
-        else:
-            words = list(Words.words)
-        
-        # Apply filters
-        filtered_words = []
-        exclude_set = {w.lower() for w in (exclude_words or [])}
-        
-        for word in words:
-            word_lower = word.lower()
-            
-            # Skip if word is too short
-            if len(word) < min_len:
-                continue
-                
-            # Check required letter
-            if required_letter and required_letter.lower() not in word_lower:
-                continue
-                
-            # Check banned letters
-            if banned_letters and any(letter.lower() in word_lower for letter in banned_letters):
-                continue
-                
-            # Check excluded words (case-insensitive)
-            if word_lower in exclude_set:
-                continue
-                
-            filtered_words.append(word)
-            
-        return filtered_words
-        
+        words = (snapshot or Words.snapshot).words
+        used = exclude_words if isinstance(exclude_words, UsedWords) else None
+        if used is not None:
+            used.rebind(words)
+        # Length and letter constraints, and a game's used words, are applied to the whole candidate range at once
+        ordinals = words.candidates(
+            min_len=min_len,
+            prefix=prefix.lower() if prefix else None,
+            required_letter=required_letter.lower() if required_letter else None,
+            banned_letters=[letter.lower() for letter in banned_letters] if banned_letters else None,
+            exclude=used,
+            suffix=suffix.lower() if suffix else None
+        )
+        if used is not None:
+            return list(words.iter_ordinals(ordinals))
+        # Words are stored in lowercase, as are the words games exclude
+        exclude_words = exclude_words or ()
+        return [word for word in words.iter_ordinals(ordinals) if word not in exclude_words]
+
     except Exception as e:
         logger.error(f"Error in filter_words: {e}")
         return []
 
 
+def count_words(
+    min_len: int = 1,
+    prefix: Optional[str] = None,
+    required_letter: Optional[str] = None,
+    banned_letters: Optional[List[str]] = None,
+    exclude_words: Union[Set[str], UsedWords, None] = None,
+    snapshot: Optional[Snapshot] = None,
+    suffix: Optional[str] = None,
+    limit: Optional[int] = None
+) -> int:
+    """Number of words satisfying the given criteria, counting no further than limit if given"""
+    if exclude_words is not None and not isinstance(exclude_words, UsedWords):
+        n = len(filter_words(min_len, prefix, required_letter, banned_letters, exclude_words, snapshot, suffix))
+        return n if limit is None else min(n, limit)
+    words = (snapshot or Words.snapshot).words
+    if exclude_words is not None:
+        exclude_words.rebind(words)
+    return words.count_candidates(
+        min_len=min_len,
+        prefix=prefix.lower() if prefix else None,
+        required_letter=required_letter.lower() if required_letter else None,
+        banned_letters=[letter.lower() for letter in banned_letters] if banned_letters else None,
+        exclude=exclude_words,
+        suffix=suffix.lower() if suffix else None,
+        limit=limit
+    )
+
+
 def get_random_word(
     min_len: int = 1,
     prefix: Optional[str] = None,
     required_letter: Optional[str] = None,
     banned_letters: Optional[List[str]] = None,
-    exclude_words: Optional[Set[str]] = None
+    exclude_words: Union[Set[str], UsedWords, None] = None,
+    snapshot: Optional[Snapshot] = None,
+    suffix: Optional[str] = None
 ) -> Optional[str]:
-    words = filter_words(min_len, prefix, required_letter, banned_letters, exclude_words)
-    return random.choice(words) if words else None
+    words = (snapshot or Words.snapshot).words
+    if isinstance(exclude_words, UsedWords):
+        exclude_words.rebind(words)
+    return words.sample(
+        min_len=min_len,
+        prefix=prefix.lower() if prefix else None,
+        required_letter=required_letter.lower() if required_letter else None,
+        banned_letters=[letter.lower() for letter in banned_letters] if banned_letters else None,
+        exclude_words=exclude_words,
+        suffix=suffix.lower() if suffix else None
+    )
+
+
+def get_vp_word(
+    tier: VPTier,
+    followers: np.ndarray,
+    min_len: int = 1,
+    prefix: Optional[str] = None,
+    required_letter: Optional[str] = None,
+    banned_letters: Optional[List[str]] = None,
+    exclude_words: Optional[UsedWords] = None,
+    snapshot: Optional[Snapshot] = None,
+    suffix: Optional[str] = None,
+    by_first_letter: bool = False
+) -> Optional[str]:
+    """Word satisfying the given criteria chosen by a virtual player of the given tier,
+    followers being the next player's answers by the letter the word ends with, or starts with if by_first_letter"""
+    snapshot = snapshot or Words.snapshot
+    words = snapshot.words
+    if exclude_words is not None:
+        exclude_words.rebind(words)
+    ordinals = words.candidates(
+        min_len=min_len,
+        prefix=prefix.lower() if prefix else None,
+        required_letter=required_letter.lower() if required_letter else None,
+        banned_letters=[letter.lower() for letter in banned_letters] if banned_letters else None,
+        exclude=exclude_words,
+        suffix=suffix.lower() if suffix else None
+    )
+    if not len(ordinals):
+        return None
+    letters = words.first_letters_of(ordinals) if by_first_letter else snapshot.stats.last_letters[ordinals]
+    i = tier.choose(words.lengths_of(ordinals), letters, followers, min_len)
+    return words[int(ordinals[i])]
+
+
+def get_longest_word(
+    max_len: int,
+    min_len: int = 1,
+    prefix: Optional[str] = None,
+    required_letter: Optional[str] = None,
+    banned_letters: Optional[List[str]] = None,
+    exclude_words: Optional[UsedWords] = None,
+    snapshot: Optional[Snapshot] = None
+) -> Optional[str]:
+    """Word satisfying the given criteria as long as possible up to max_len letters, or else the shortest longer one.
+    prefix must be a single letter"""
+    snapshot = snapshot or Words.snapshot
+    if exclude_words is not None:
+        exclude_words.rebind(snapshot.words)
+    ordinal = snapshot.longest.longest(
+        prefix.lower() if prefix else "",
+        max_len,
+        min_len=min_len,
+        required_letter=required_letter.lower() if required_letter else None,
+        banned_letters=[letter.lower() for letter in banned_letters] if banned_letters else None,
+        exclude=exclude_words
+    )
+    return snapshot.words[ordinal] if ordinal is not None else None
+
+
+def suggest_words(
+    word: str,
+    min_len: int = 1,
+    prefix: Optional[str] = None,
+    required_letter: Optional[str] = None,
+    banned_letters: Optional[List[str]] = None,
+    exclude_words: Union[Set[str], UsedWords, None] = None,
+    snapshot: Optional[Snapshot] = None,
+    suffix: Optional[str] = None
+) -> List[str]:
+    """Words within one typo of word that satisfy the given criteria"""
+    words = (snapshot or Words.snapshot).words
+    if isinstance(exclude_words, UsedWords):
+        exclude_words.rebind(words)
+    return words.suggest(
+        word.lower(),
+        min_len=min_len,
+        prefix=prefix.lower() if prefix else None,
+        required_letter=required_letter.lower() if required_letter else None,
+        banned_letters=[letter.lower() for letter in banned_letters] if banned_letters else None,
+        exclude_words=exclude_words,
+        suffix=suffix.lower() if suffix else None
+    )
 
 
 async def send_admin_group(*args: Any, **kwargs: Any) -> Optional[types.Message]:
@@ -95,6 +215,46 @@ async def send_admin_group(*args: Any, **kwargs: Any) -> Optional[types.Message]
         return None
 
 
+class LRUCache:
+    """Mapping holding at most maxsize entries, evicting the least recently used. Counts hits and misses."""
+
+    __slots__ = ("maxsize", "entries", "hits", "misses")
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Rendered inline query word results by word list version and prefix
+inline_results_cache = LRUCache(4096)
+
+
 @cached(ttl=3600)
 async def amt_donated(user_id: int) -> int:
     result = await db.fetchval(
@@ -1,60 +1,334 @@
+import asyncio
 import logging
-from typing import Set, List
-import aiofiles
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 import os
 
+from .dictionary import (LetterStats, LongestWords, SourceFingerprint, WordIndex, WordList, build_artifact,
+                         compile_word_list, diff_sources, load_artifact, read_source)
+
 logger = logging.getLogger(__name__)
 
+# Get the directory of the current script (on9wordchainbot/)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+# Path to words.txt in the same directory
+WORD_FILE = os.path.join(script_dir, 'words.txt')
+# Compiled form of words.txt, memory-mapped rather than parsed
+ARTIFACT_FILE = os.path.join(script_dir, 'words.bin')
+
+# Changes to words.txt are applied as overlays on the loaded word list up to this many words,
+# beyond that words.txt is recompiled and loaded instead
+MAX_OVERLAY_WORDS = 20000
+# Overlays are folded into a recompiled artifact once they hold this many words
+COMPACTION_THRESHOLD = 1000
+# Group word overlays not used by a game starting for this long are dropped from memory
+GROUP_OVERLAY_IDLE_SECONDS = 6 * 60 * 60
+
+
+class WordListUpdate(NamedTuple):
+    added: int
+    removed: int
+    seconds: float  # Time taken to find the changes in words.txt and apply them to the loaded word list
+
+
+def parse_word_list() -> WordIndex:
+    """Build the word index from words.txt, used when no artifact can be written. Blocking."""
+    with open(WORD_FILE, 'r', encoding='utf-8') as f:
+        return WordIndex.from_words(word.strip().lower() for word in f if word.strip())
+
+
+async def load_word_index(extra_words: Collection[str] = ()) -> WordIndex:
+    """Load the word list from the compiled artifact, recompiling it from words.txt and extra_words if it is stale."""
+    loop = asyncio.get_running_loop()
+    index = await loop.run_in_executor(None, load_artifact, ARTIFACT_FILE, WORD_FILE)
+    if index is not None:
+        return index
+
+    logger.info("Dictionary artifact missing or stale, compiling words.txt")
+    try:
+        # Parsing holds the GIL for a while, so do it in another process and map its output
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            await loop.run_in_executor(pool, compile_word_list, WORD_FILE, ARTIFACT_FILE, extra_words)
+        index = await loop.run_in_executor(None, load_artifact, ARTIFACT_FILE, WORD_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write dictionary artifact: {e}")
+    if index is None:
+        index = await loop.run_in_executor(None, parse_word_list)
+    return index
+
+
+async def refresh_word_list(
+    current: WordList, old_text: Optional[bytes], new_text: bytes, accepted: Collection[str]
+) -> Tuple[WordList, Optional[WordListUpdate]]:
+    """Bring the word list up to date with a changed words.txt.
+
+    The words added and removed are found by comparing the old and new contents of words.txt
+    and applied to the current word list as overlays, which keeps existing ordinals valid.
+    The artifact is left as it is until compaction recompiles it.
+    If the old contents are unknown or the changes too many, words.txt is recompiled and loaded instead.
+    """
+    t = time.time()
+    if old_text is not None:
+        loop = asyncio.get_running_loop()
+        added, removed = await loop.run_in_executor(None, diff_sources, old_text, new_text)
+        # Accepted words stay even when words.txt drops them
+        removed = [w for w in removed if w not in accepted]
+        if current.overlay_size + len(added) + len(removed) <= MAX_OVERLAY_WORDS:
+            words = current.with_changes(added, removed)
+            return words, WordListUpdate(len(added), len(removed), time.time() - t)
+    return WordList(await load_word_index(sorted(accepted))), None
+
+
+class Snapshot:
+    """A published version of the word list. Never modified, changes are published as a new snapshot.
+
+    Snapshots still referenced (e.g. by games pinned to them) stay usable after newer ones are published,
+    and are freed along with any word list they alone hold once no longer referenced.
+    """
+
+    __slots__ = ("version", "words", "count", "stats", "_longest", "__weakref__")
+
+    def __init__(self, version: int, words: WordList) -> None:
+        self.version = version
+        self.words = words
+        self.count = len(words)
+        # Letter counts for choosing words, a few milliseconds to build
+        self.stats = LetterStats.from_words(words)
+        self._longest: Optional[LongestWords] = None
+
+    @property
+    def longest(self) -> LongestWords:
+        # Only virtual players in elimination games need it, so built on first use
+        if self._longest is None:
+            self._longest = LongestWords.from_words(self.words)
+        return self._longest
+
+
 class Words:
-    # Simple set to store words
-    words: Set[str] = set()
-    count: int = 0
+    # Current snapshot, readers take the reference once and use it without locking.
+    # Its word list is the base index mapped from words.bin, with small overlays of changes
+    snapshot: Snapshot = Snapshot(0, WordList(WordIndex.from_words(())))
+    # Snapshots still referenced anywhere, by version
+    live_snapshots: "weakref.WeakValueDictionary[int, Snapshot]" = weakref.WeakValueDictionary()
+    # Fingerprint and contents of the words.txt the word list reflects, compared with words.txt to find changes
+    source: Optional[SourceFingerprint] = None
+    source_text: Optional[bytes] = None
+    # Words accepted through /addword, kept in the database rather than words.txt
+    accepted: Set[str] = set()
+
+    # Set once the first word list is loaded, games cannot start before that
+    ready: asyncio.Event = asyncio.Event()
+    update_lock: asyncio.Lock = asyncio.Lock()
+    # Background task loading the first word list
+    loading_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def _publish_snapshot(cls, words: WordList) -> None:
+        # Swapping the reference is atomic, so readers see either the old snapshot or the new one
+        snapshot = Snapshot(cls.snapshot.version + 1, words)
+        cls.live_snapshots[snapshot.version] = snapshot
+        cls.snapshot = snapshot
+
+    @classmethod
+    def _publish(cls, words: WordList, source: Optional[SourceFingerprint], source_text: Optional[bytes]) -> None:
+        # Accepted words are applied to every word list loaded, whether or not it already has them
+        if cls.accepted:
+            words = words.with_changes(cls.accepted)
+        cls._publish_snapshot(words)
+        cls.source = source
+        cls.source_text = source_text
+        cls.ready.set()
+
+    @classmethod
+    def live_versions(cls) -> List[int]:
+        """Versions of the snapshots still in use, including the current one."""
+        return sorted(cls.live_snapshots.keys())
+
+    @classmethod
+    async def update(cls) -> Optional[WordListUpdate]:
+        """Update the word list without blocking the event loop.
+
+        Does nothing if words.txt is unchanged. Returns the numbers of words added and removed
+        if the change was applied incrementally.
+        """
+        async with cls.update_lock:  # Avoid concurrent reloads
+            loop = asyncio.get_running_loop()
+            t = time.time()
+            try:
+                try:
+                    # Unread if its size and mtime are unchanged
+                    source, text = await loop.run_in_executor(None, read_source, WORD_FILE, cls.source)
+                except FileNotFoundError:  # The artifact is the only copy of the word list
+                    source, text = None, None
+
+                if not cls.ready.is_set():
+                    logger.info("Loading word list from words.txt")
+                    words, result = WordList(await load_word_index(sorted(cls.accepted))), None
+                elif source is None or cls.source and source.digest == cls.source.digest:
+                    # Remember the new mtime of a touched file so that it is not hashed again
+                    cls.source = source or cls.source
+                    logger.info("words.txt unchanged, word list not updated")
+                    return None
+                else:
+                    logger.info("words.txt changed, updating word list")
+                    words, result = await refresh_word_list(
+                        cls.snapshot.words, cls.source_text, text, cls.accepted
+                    )
+            except Exception as e:
+                # Keep serving the current word list
+                logger.error(f"Error loading word list: {e}")
+                return None
+
+            cls._publish(words, source, text)
+            if result:
+                logger.info(
+                    f"Word list updated: {result.added} added, {result.removed} removed "
+                    f"in {result.seconds * 1000:.1f}ms ({cls.snapshot.count} words)"
+                )
+            else:
+                logger.info(f"Successfully loaded {cls.snapshot.count} words from words.txt in {time.time() - t:.3f}s")
+            return result
+
+    @classmethod
+    def add(cls, words: Iterable[str]) -> None:
+        """Add accepted words to the word list immediately. They are kept across reloads of words.txt."""
+        words = [w.lower() for w in words]
+        cls.accepted.update(words)
+        if cls.ready.is_set():  # Otherwise they are added once the word list is loaded
+            cls._publish_snapshot(cls.snapshot.words.with_changes(words))
 
     @classmethod
-    async def update(cls) -> None:
-        """Update the word list from the word.txt file."""
-        logger.info("Loading word list from words.txt")
+    async def load_accepted(cls) -> None:
+        """Add the words accepted through /addword to the word list."""
+        from . import db
+
         try:
-            # Get the directory of the current script (on9wordchainbot/)
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            # Path to words.txt in the same directory
-            word_file = os.path.join(script_dir, 'words.txt')
-            
-            # Read words from the file
-            async with aiofiles.open(word_file, 'r', encoding='utf-8') as f:
-                words = await f.read()
-                cls.words = {word.strip().lower() for word in words.split('\n') if word.strip()}
-                cls.count = len(cls.words)
-                
-            logger.info(f"Successfully loaded {cls.count} words from words.txt")
+            rows = await db.fetch("SELECT word FROM wordlist WHERE accepted;")
         except Exception as e:
-            logger.error(f"Error loading word list: {e}")
-            cls.words = set()
-            cls.count = 0
+            logger.error(f"Error loading accepted words: {e}")
+            return
+        cls.add(row["word"] for row in rows)
+        logger.info(f"Loaded {len(rows)} accepted words")
+
+    @classmethod
+    async def load(cls) -> None:
+        """Load the word list at startup, with the accepted words applied once it is loaded.
+
+        The word list loads in the background, games can start once Words.ready is set.
+        """
+        await cls.load_accepted()
+        cls.loading_task = asyncio.create_task(cls.update())
+
+    @classmethod
+    async def compact(cls, threshold: int = COMPACTION_THRESHOLD) -> None:
+        """Fold the overlays into a recompiled artifact once they hold at least threshold words.
+
+        Lookups then no longer consult the overlays. The artifact is compiled in another process.
+        """
+        async with cls.update_lock:
+            overlay_size = cls.snapshot.words.overlay_size
+            if not cls.ready.is_set() or overlay_size < threshold:
+                return
+
+            loop = asyncio.get_running_loop()
+            t = time.time()
+            try:
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    source = await loop.run_in_executor(
+                        pool, build_artifact, WORD_FILE, ARTIFACT_FILE, sorted(cls.accepted)
+                    )
+                index = await loop.run_in_executor(None, load_artifact, ARTIFACT_FILE, None)
+            except Exception as e:
+                logger.error(f"Error compacting word list: {e}")
+                return
+            if index is None:
+                logger.error("Error compacting word list: compiled artifact could not be loaded")
+                return
+
+            # The contents compiled are only known if they are those of the word list being replaced
+            same_source = cls.source is not None and source is not None and source.digest == cls.source.digest
+            cls._publish(WordList(index), source, cls.source_text if same_source else None)
+            logger.info(
+                f"Word list compacted: {overlay_size} overlay words folded in {time.time() - t:.3f}s "
+                f"({cls.snapshot.count} words)"
+            )
 
     @classmethod
     def __contains__(cls, word: str) -> bool:
         """Check if a word exists in the word list."""
-        return word.lower() in cls.words
+        return word.lower() in cls.snapshot.words
 
     @classmethod
-    def starts_with(cls, prefix: str) -> List[str]:
-        """Find all words that start with the given prefix."""
-        prefix = prefix.lower()
-        return [word for word in cls.words if word.startswith(prefix)]
+    def starts_with(cls, prefix: str) -> Iterator[str]:
+        """Lazily yield words that start with the given prefix in alphabetical order."""
+        return cls.snapshot.words.starts_with(prefix.lower())
 
-# Initialize words on import
-if __name__ != "__main__":
-    import asyncio
-    
-    async def initialize():
-        await Words.update()
-    
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            loop.create_task(Words.update())
+
+class GroupOverlay(NamedTuple):
+    """Words a group allows on top of the word list, and words it blocks from it."""
+    allowed: FrozenSet[str]
+    blocked: FrozenSet[str]
+
+
+EMPTY_OVERLAY = GroupOverlay(frozenset(), frozenset())
+
+
+class GroupOverlays:
+    """Per-group word overlays, kept in the database and loaded when a game starts.
+
+    Games use an overlay alongside the shared word list rather than a copy of it,
+    so a group costs memory in proportion to its overlay only.
+    """
+
+    # Overlays loaded, by group id, with the time they were last used
+    loaded: Dict[int, Tuple[GroupOverlay, float]] = {}
+
+    @classmethod
+    async def get(cls, group_id: int) -> GroupOverlay:
+        """Overlay of a group, loaded from the database if not in memory."""
+        from . import db
+
+        entry = cls.loaded.get(group_id)
+        if entry is not None:
+            overlay = entry[0]
         else:
-            loop.run_until_complete(Words.update())
-    except RuntimeError:
-        asyncio.run(Words.update())
\ No newline at end of file
+            try:
+                rows = await db.fetch("SELECT word, allowed FROM groupword WHERE group_id = ?;", group_id)
+            except Exception as e:  # Play with the shared word list alone
+                logger.error(f"Error loading word overlay of group {group_id}: {e}")
+                return EMPTY_OVERLAY
+            overlay = GroupOverlay(
+                frozenset(row["word"] for row in rows if row["allowed"]),
+                frozenset(row["word"] for row in rows if not row["allowed"])
+            ) if rows else EMPTY_OVERLAY
+        cls.loaded[group_id] = (overlay, time.monotonic())
+        return overlay
+
+    @classmethod
+    async def set_words(cls, group_id: int, words: Iterable[str], allowed: Optional[bool]) -> None:
+        """Allow or block words in a group, or remove them from its overlay if allowed is None.
+        Running games keep the overlay they started with.
+        """
+        from . import db
+
+        for word in words:
+            if allowed is None:
+                await db.execute("DELETE FROM groupword WHERE group_id = ? AND word = ?;", group_id, word)
+            else:
+                await db.execute(
+                    "INSERT OR REPLACE INTO groupword (group_id, word, allowed) VALUES (?, ?, ?);",
+                    group_id, word, int(allowed)
+                )
+        cls.loaded.pop(group_id, None)
+
+    @classmethod
+    async def evict_idle(cls, max_idle: float = GROUP_OVERLAY_IDLE_SECONDS) -> None:
+        """Drop overlays no game has started with for max_idle seconds."""
+        now = time.monotonic()
+        idle = [group_id for group_id, (_, last_used) in cls.loaded.items() if now - last_used > max_idle]
+        for group_id in idle:
+            del cls.loaded[group_id]
+        if idle:
+            logger.info(f"Evicted {len(idle)} idle group word overlays")